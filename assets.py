@@ -0,0 +1,250 @@
+import pygame
+import random
+import json
+import os
+
+OBSTACLES_FOLDER = "imgs/obstacles/"
+OBSTACLE_SIZE = (40, 80)
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.PNG', '.JPG', '.JPEG')
+
+# Атлас: все спрайты машин в одной картинке (собирается build_atlas.py)
+ATLAS_IMAGE = "imgs/atlas.png"
+ATLAS_INDEX = "imgs/atlas.json"
+
+# Цвета простых машинок (если картинок нет)
+SIMPLE_CAR_COLORS = [
+    (0, 0, 255),    # Синий
+    (255, 165, 0),  # Оранжевый
+    (128, 0, 128),  # Фиолетовый
+    (0, 255, 255),  # Голубой
+    (255, 192, 203) # Розовый
+]
+
+
+class AssetCache:
+    """Общий кэш картинок: каждая картинка читается с диска один раз"""
+
+    def __init__(self):
+        self._images = {}    # (путь, размер) -> Surface
+        self._folders = {}   # (папка, размер) -> список Surface
+        self._masks = {}     # id(Surface) -> (Surface, Mask) для точных столкновений
+        self._box_masks = {} # размер -> сплошная Mask (когда картинки нет)
+        self.hits = 0
+        self.misses = 0
+        self.atlas_loaded = False
+
+    def get_image(self, path, size=None):
+        """Картинка из кэша (загружаем с диска только при первом запросе)"""
+        key = (path, size)
+        image = self._images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        image = pygame.image.load(path)
+        if size is not None:
+            image = pygame.transform.scale(image, size)
+        image = self._convert(image)
+        self._images[key] = image
+        return image
+
+    def get_folder_images(self, folder, size=None):
+        """Все картинки из папки (папку сканируем один раз)"""
+        key = (folder, size)
+        images = self._folders.get(key)
+        if images is not None:
+            self.hits += 1
+            return images
+
+        self.misses += 1
+        images = []
+        for path in list_images(folder):
+            try:
+                images.append(self.get_image(path, size))
+            except Exception as e:
+                print(f"Ошибка загрузки изображения: {e}")
+        self._folders[key] = images
+        return images
+
+    def put_image(self, path, size, image):
+        """Кладём в кэш картинку, прочитанную в другом месте (фоновая загрузка)"""
+        image = self._convert(image)
+        self._images[(path, size)] = image
+        return image
+
+    def has_image(self, path, size=None):
+        """Картинка уже в кэше?"""
+        return (path, size) in self._images
+
+    def put_folder_images(self, folder, size, images):
+        """Кладём в кэш готовый список картинок папки"""
+        self._folders[(folder, size)] = images
+
+    def get_mask(self, image):
+        """Маска непрозрачных пикселей картинки (строится один раз на картинку)
+
+        Все машины с одним спрайтом используют одну и ту же маску.
+        """
+        entry = self._masks.get(id(image))
+        if entry is not None:
+            return entry[1]
+        mask = pygame.mask.from_surface(image)
+        # Храним и саму картинку, чтобы её id не достался другой картинке
+        self._masks[id(image)] = (image, mask)
+        return mask
+
+    def get_box_mask(self, size):
+        """Сплошная прямоугольная маска (для машин без картинки)"""
+        mask = self._box_masks.get(size)
+        if mask is None:
+            mask = pygame.Mask(size, fill=True)
+            self._box_masks[size] = mask
+        return mask
+
+    def get_obstacle_sprites(self):
+        """Спрайты встречных машин (картинки из папки или простые машинки)"""
+        key = ("simple_cars", OBSTACLE_SIZE)
+        sprites = self.get_folder_images(OBSTACLES_FOLDER, OBSTACLE_SIZE)
+        if sprites:
+            return sprites
+
+        # Папка пустая - рисуем простые машинки один раз и тоже кэшируем
+        sprites = self._folders.get(key)
+        if sprites is None:
+            sprites = [create_simple_car(color, OBSTACLE_SIZE) for color in SIMPLE_CAR_COLORS]
+            self._folders[key] = sprites
+        return sprites
+
+    def random_obstacle_sprite(self, rng=random):
+        """Случайный спрайт встречной машины (общий Surface, не копия)"""
+        return rng.choice(self.get_obstacle_sprites())
+
+    def put_atlas(self, index, atlas):
+        """Раскладываем атлас по кэшу: каждый спрайт - кусок одной картинки (subsurface)"""
+        atlas = self._convert(atlas)
+        for sprite in index['sprites']:
+            key = (sprite['path'], tuple(sprite['size']))
+            self._images[key] = atlas.subsurface(sprite['rect'])
+        for folder in index['folders']:
+            size = tuple(folder['size'])
+            self._folders[(folder['folder'], size)] = [
+                self._images[(path, size)] for path in folder['paths']]
+        self.atlas_loaded = True
+
+    def load_atlas(self, index_path=ATLAS_INDEX):
+        """Загружаем атлас, если он есть и не устарел (иначе - отдельные файлы)"""
+        index = read_atlas_index(index_path)
+        if index is None:
+            return False
+        try:
+            atlas = pygame.image.load(atlas_image_path(index_path, index))
+        except Exception as e:
+            print(f"Ошибка загрузки атласа: {e}")
+            return False
+        self.put_atlas(index, atlas)
+        return True
+
+    def warm_up(self):
+        """Заранее загружаем все спрайты (до начала игры)"""
+        if not self.atlas_loaded:
+            self.load_atlas()
+        self.get_obstacle_sprites()
+
+    def _convert(self, image):
+        """convert_alpha() возможен только когда окно уже создано"""
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            return image.convert_alpha()
+        return image
+
+    def get_stats(self):
+        """Статистика кэша: попадания, промахи, занятая память"""
+        # Куски атласа занимают память атласа - считаем его один раз
+        surfaces = {}
+        for image in self._images.values():
+            image = image.get_parent() or image
+            surfaces[id(image)] = image
+        for images in self._folders.values():
+            for image in images:
+                image = image.get_parent() or image
+                surfaces[id(image)] = image
+
+        bytes_resident = 0
+        for image in surfaces.values():
+            bytes_resident += image.get_pitch() * image.get_height()
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'images': len(surfaces),
+            'masks': len(self._masks) + len(self._box_masks),
+            'bytes_resident': bytes_resident,
+        }
+
+    def clear(self):
+        """Очищаем кэш (например, после смены режима экрана)"""
+        self._images.clear()
+        self._folders.clear()
+        self._masks.clear()
+        self._box_masks.clear()
+        self.hits = 0
+        self.misses = 0
+        self.atlas_loaded = False
+
+
+def list_images(folder):
+    """Пути ко всем картинкам папки (по алфавиту; нет папки - пустой список)"""
+    if not os.path.exists(folder):
+        return []
+    return [os.path.join(folder, name) for name in sorted(os.listdir(folder))
+            if name.endswith(IMAGE_EXTENSIONS)]
+
+
+def atlas_image_path(index_path, index):
+    """Путь к картинке атласа (она лежит рядом с файлом индекса)"""
+    return os.path.join(os.path.dirname(index_path), index['image'])
+
+
+def read_atlas_index(index_path=ATLAS_INDEX):
+    """Индекс атласа или None, если атласа нет или он устарел
+
+    Атлас устарел, если в папках появились или пропали картинки или
+    какая-то картинка изменилась после сборки атласа.
+    """
+    if not os.path.exists(index_path):
+        return None
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        built = os.path.getmtime(atlas_image_path(index_path, index))
+        for folder in index['folders']:
+            if list_images(folder['folder']) != folder['paths']:
+                raise ValueError("изменился список картинок в " + folder['folder'])
+        for sprite in index['sprites']:
+            if os.path.getmtime(sprite['path']) > built:
+                raise ValueError("изменилась картинка " + sprite['path'])
+    except Exception as e:
+        print(f"Атлас не используется ({e}), загружаем отдельные файлы")
+        return None
+    return index
+
+
+def create_simple_car(color, size=OBSTACLE_SIZE):
+    """Создаём простое изображение машины"""
+    image = pygame.Surface(size, pygame.SRCALPHA)
+
+    # Кузов
+    pygame.draw.rect(image, color, (10, 20, 40, 50))
+    # Крыша
+    dark = tuple(c // 2 for c in color)
+    pygame.draw.rect(image, dark, (15, 10, 30, 25))
+    # Колёса
+    pygame.draw.circle(image, (0, 0, 0), (18, 25), 6)
+    pygame.draw.circle(image, (0, 0, 0), (42, 25), 6)
+    pygame.draw.circle(image, (0, 0, 0), (18, 65), 6)
+    pygame.draw.circle(image, (0, 0, 0), (42, 65), 6)
+    return image
+
+
+# Один кэш на весь процесс
+assets = AssetCache()
@@ -0,0 +1,105 @@
+import pygame
+
+
+class AudioManager:
+    """Звук всей игры: микшер настраивается один раз, звуки загружаются один раз
+
+    У каждого вида звука свой канал микшера, поэтому сигнал, мотор и удар
+    не перебивают друг друга.
+    """
+
+    # Зарезервированные каналы
+    CHANNELS = {
+        'horn': 0,    # Сигнал
+        'engine': 1,  # Мотор
+        'crash': 2,   # Столкновение
+    }
+
+    def __init__(self, frequency=44100, buffer=512, num_channels=8):
+        self.frequency = frequency
+        self.buffer = buffer          # Маленький буфер - маленькая задержка звука
+        self.num_channels = num_channels
+        self.enabled = False
+        self._sounds = {}             # путь -> Sound (или None, если не загрузился)
+        self._tones = {}              # (частота, длительность, частота дискретизации) -> Sound
+        self._channels = {}
+
+    def configure(self):
+        """Настройки микшера - вызывать до pygame.init()"""
+        pygame.mixer.pre_init(self.frequency, -16, 2, self.buffer)
+
+    def init(self):
+        """Включаем микшер (повторные вызовы ничего не делают)"""
+        if self.enabled:
+            return True
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(self.frequency, -16, 2, self.buffer)
+            pygame.mixer.set_num_channels(max(self.num_channels, len(self.CHANNELS)))
+            pygame.mixer.set_reserved(len(self.CHANNELS))
+            self._channels = {name: pygame.mixer.Channel(i) for name, i in self.CHANNELS.items()}
+            self.enabled = True
+        except pygame.error as e:
+            print(f"Звук недоступен: {e}")
+        return self.enabled
+
+    def load(self, path):
+        """Звук из файла (с диска - только при первом запросе)"""
+        if path in self._sounds:
+            return self._sounds[path]
+        sound = None
+        if self.init():
+            try:
+                sound = pygame.mixer.Sound(path)
+            except Exception:
+                sound = None
+        self._sounds[path] = sound
+        return sound
+
+    def put(self, path, sound):
+        """Кладём в кэш звук, прочитанный в другом месте (фоновая загрузка)"""
+        self._sounds[path] = sound
+
+    def preload(self, paths):
+        """Загружаем звуки заранее"""
+        for path in paths:
+            self.load(path)
+
+    def tone(self, frequency, duration, sample_rate=None):
+        """Синусоида заданной частоты (генерируем один раз и кэшируем)"""
+        if not self.init():
+            return None
+        if sample_rate is None:
+            # Звук должен совпадать с частотой микшера, иначе изменится высота
+            sample_rate = pygame.mixer.get_init()[0]
+        key = (frequency, duration, sample_rate)
+        sound = self._tones.get(key)
+        if sound is None:
+            # NumPy нужен только здесь - импортируем при первом тоне
+            import numpy as np
+            samples = np.sin(2 * np.pi * frequency *
+                             np.linspace(0, duration, int(sample_rate * duration)))
+            samples = (samples * 32767).astype(np.int16)
+            stereo_samples = np.column_stack((samples, samples))
+            sound = pygame.sndarray.make_sound(stereo_samples)
+            self._tones[key] = sound
+        return sound
+
+    def play(self, sound, channel='horn'):
+        """Играем звук на его собственном канале"""
+        if sound is None or not self.enabled:
+            return False
+        self._channels[channel].play(sound)
+        return True
+
+    def get_stats(self):
+        """Сколько звуков в кэше"""
+        return {
+            'sounds': sum(1 for s in self._sounds.values() if s is not None),
+            'tones': len(self._tones),
+            'enabled': self.enabled,
+        }
+
+
+# Один звук на весь процесс
+audio = AudioManager()
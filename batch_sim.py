@@ -0,0 +1,190 @@
+"""Пакетная симуляция для настройки сложности
+
+Прогоняет много заездов без окна на всех ядрах процессора (управляет бот)
+и собирает статистику: сколько живёт игрок, распределение очков,
+как происходят столкновения. Параметры сложности (difficulty.py) можно
+перебирать - каждое сочетание прогоняется на одних и тех же зёрнах.
+
+Запуск:
+    python batch_sim.py --runs 2000 --policy dodge
+    python batch_sim.py --sweep spawn_delay_min=40,60,80 --sweep obstacle_speed_per_point=0.05,0.1
+    python batch_sim.py --output report.json
+    python batch_sim.py --lanes 3      # машины по полосам
+"""
+import os
+
+# Без окна и звука: SDL-драйверы-заглушки (до импорта pygame)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import itertools
+import json
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from controllers import POLICIES
+from difficulty import Difficulty
+
+
+# ===== Работа одного процесса =====
+
+_game = None  # Одна игра на процесс, используется для всех заездов
+
+
+def _get_game(tick_rate, lanes):
+    global _game
+    if _game is None or _game.tick_rate != tick_rate or _game.lanes != lanes:
+        from game import Game
+        _game = Game(headless=True, tick_rate=tick_rate, lanes=lanes)
+    return _game
+
+
+def run_batch(task):
+    """Прогоняем пачку заездов одного сочетания параметров"""
+    config, params, policy_name, seeds, max_seconds, tick_rate, lanes = task
+    game = _get_game(tick_rate, lanes)
+    game.difficulty = Difficulty(**params)
+    results = []
+    for seed in seeds:
+        policy = POLICIES[policy_name](seed)
+        result = game.simulate(policy, int(max_seconds * tick_rate), seed)
+        results.append({
+            'config': config,
+            'seed': seed,
+            'score': result['score'],
+            'survival': result['frames'] / tick_rate,
+            'cause': result['cause'] if result['crashed'] else 'timeout',
+        })
+    return results
+
+
+# ===== Отчёт =====
+
+def summarize(values):
+    """Среднее и перцентили"""
+    values = np.asarray(values, dtype=np.float64)
+    p10, p50, p90 = np.percentile(values, [10, 50, 90])
+    return {
+        'mean': float(values.mean()),
+        'p10': float(p10),
+        'p50': float(p50),
+        'p90': float(p90),
+        'max': float(values.max()),
+    }
+
+
+def aggregate(params, results):
+    """Статистика одного сочетания параметров"""
+    scores = [r['score'] for r in results]
+    counts, edges = np.histogram(scores, bins=10)
+    causes = Counter(r['cause'] for r in results)
+    return {
+        'params': params,
+        'runs': len(results),
+        'survival_s': summarize([r['survival'] for r in results]),
+        'score': summarize(scores),
+        'score_histogram': {'edges': edges.tolist(), 'counts': counts.tolist()},
+        'causes': dict(causes.most_common()),
+    }
+
+
+def parse_sweep(items):
+    """--sweep имя=з1,з2 -> список сочетаний параметров"""
+    defaults = Difficulty().as_dict()
+    names = []
+    values = []
+    for item in items:
+        name, _, text = item.partition('=')
+        if name not in defaults:
+            raise SystemExit(f"Нет такого параметра сложности: {name} (есть: {', '.join(defaults)})")
+        names.append(name)
+        values.append([float(v) for v in text.split(',')])
+    configs = []
+    for combination in itertools.product(*values):
+        params = dict(defaults)
+        params.update(zip(names, combination))
+        configs.append(params)
+    return configs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная симуляция заездов")
+    parser.add_argument("--runs", type=int, default=1000, help="заездов на каждое сочетание параметров")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random", help="бот")
+    parser.add_argument("--max-seconds", type=float, default=120, help="ограничение заезда (секунды игры)")
+    parser.add_argument("--tick-rate", type=int, default=60, help="шагов симуляции в секунду")
+    parser.add_argument("--lanes", type=int, metavar="N", help="машины едут по N полосам")
+    parser.add_argument("--seed", type=int, default=0, help="зерно для зёрен заездов")
+    parser.add_argument("--sweep", action="append", default=[], metavar="ИМЯ=З1,З2",
+                        help="перебрать значения параметра сложности (можно несколько раз)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="процессов (1 - без пула)")
+    parser.add_argument("--chunk", type=int, default=25, help="заездов в одной задаче процесса")
+    parser.add_argument("--output", metavar="FILE", help="записать отчёт в JSON")
+    args = parser.parse_args()
+
+    # Картинки ищутся относительно папки игры
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    configs = parse_sweep(args.sweep)
+    # Одни и те же зёрна для всех сочетаний - сравниваем параметры, а не удачу
+    seed_source = random.Random(args.seed)
+    seeds = [seed_source.getrandbits(32) for _ in range(args.runs)]
+    tasks = [
+        (config, params, args.policy, seeds[start:start + args.chunk], args.max_seconds, args.tick_rate,
+         args.lanes)
+        for config, params in enumerate(configs)
+        for start in range(0, len(seeds), args.chunk)
+    ]
+
+    start = time.perf_counter()
+    results = [[] for _ in configs]
+    if args.workers == 1:
+        batches = map(run_batch, tasks)
+    else:
+        executor = ProcessPoolExecutor(args.workers)
+        batches = executor.map(run_batch, tasks)
+    for batch in batches:
+        for result in batch:
+            results[result['config']].append(result)
+    if args.workers != 1:
+        executor.shutdown()
+    elapsed = time.perf_counter() - start
+
+    total = len(configs) * args.runs
+    report = {
+        'meta': {
+            'policy': args.policy,
+            'runs': args.runs,
+            'max_seconds': args.max_seconds,
+            'tick_rate': args.tick_rate,
+            'lanes': args.lanes,
+            'workers': args.workers,
+            'elapsed_s': elapsed,
+            'runs_per_sec': total / elapsed if elapsed else 0.0,
+        },
+        'configs': [aggregate(params, config_results)
+                    for params, config_results in zip(configs, results)],
+    }
+
+    defaults = Difficulty().as_dict()
+    for config in report['configs']:
+        changed = {k: v for k, v in config['params'].items() if v != defaults[k]} or "по умолчанию"
+        survival = config['survival_s']
+        score = config['score']
+        print(f"{changed}: живёт {survival['p50']:.1f} с (p10 {survival['p10']:.1f}, p90 {survival['p90']:.1f}), "
+              f"очки {score['mean']:.1f} (p50 {score['p50']:.0f}, p90 {score['p90']:.0f}), "
+              f"столкновения {config['causes']}")
+    print(f"{total} заездов за {elapsed:.1f} с ({report['meta']['runs_per_sec']:.0f} заездов/с)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Замеры скорости горячих участков игры
+
+Запуск:
+    python benchmark.py                            # замер, результаты в JSON на экран
+    python benchmark.py --output results.json      # сохранить результаты
+    python benchmark.py --save-baseline base.json  # запомнить как эталон
+    python benchmark.py --baseline base.json       # сравнить с эталоном (код выхода 1 при регрессии)
+"""
+import os
+
+# Без окна и звука: SDL-драйверы-заглушки (до импорта pygame)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from game import Game
+from game_state import GameState
+from lighting import lighting
+from effects import ParticleSystem, SPARK, SMOKE, DEBRIS
+from obstacle import ObstacleCar
+
+OBSTACLE_COUNTS = (10, 100, 1000)
+
+
+def measure(func, number, repeat):
+    """Время одного вызова func в микросекундах: (медиана, лучшее)"""
+    func()  # Прогрев
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number * 1e6)
+    return statistics.median(times), min(times)
+
+
+def spawn_beside_player(game, rng, y):
+    """Машина с обычной скоростью в стороне от игрока (столкновения не будет)"""
+    store = game.obstacles
+    gap = (game.car.get_rect().width + store.width) // 2 + 10
+    car_x = int(game.car.x)
+    low, high = rng.choice([
+        (game.road.get_left_edge() + store.width // 2, car_x - gap),
+        (car_x + gap, game.road.get_right_edge() - store.width // 2),
+    ])
+    speed = game.difficulty.obstacle_speed(game.road.get_current_speed(), 0)
+    store.spawn(rng.randint(low, high), y, speed, rng=rng)
+
+
+def fill_obstacles(game, count, seed=0):
+    """Заполняем дорогу движущимися машинами по всей высоте экрана"""
+    rng = random.Random(seed)
+    game.obstacles.clear()
+    for _ in range(count):
+        spawn_beside_player(game, rng, rng.uniform(-50, game.height + 50))
+    game.obstacle_spawn_timer = -1e9  # Сама игра во время замера машины не добавляет
+    return rng
+
+
+def keep_filled(game, count, rng):
+    """Ушедшие за экран машины заменяем новыми сверху - число машин не меняется"""
+    while game.obstacles.count < count:
+        spawn_beside_player(game, rng, -50)
+
+
+def make_game(headless=False):
+    """Игра с окном-заглушкой (или без окна) и без файла рекорда"""
+    game = Game(headless=headless, seed=0, leaderboard_file=None)
+    game.score_manager.save_file = None
+    game.reset_game(seed=0)
+    return game
+
+
+def run_benchmarks(number, repeat):
+    """Выполняем все замеры: {имя: {'median_us', 'best_us', 'ops_per_sec'}}"""
+    game = make_game()
+    simulation = make_game(headless=True)  # Для замеров логики
+    screen = game.screen
+    benchmarks = {}
+
+    rng = random.Random(0)
+    benchmarks['obstacle_car_construct'] = lambda: ObstacleCar(400, -50, 5, rng=rng)
+
+    benchmarks['road_draw'] = lambda: game.road.draw(screen)
+
+    def car_draw(headlights):
+        def run():
+            game.car.headlights_on = headlights
+            game.car.draw(screen)
+        return run
+    benchmarks['car_draw'] = car_draw(False)
+    benchmarks['car_draw_headlights'] = car_draw(True)
+
+    benchmarks['night_overlay'] = lambda: lighting.draw_night(screen, game.car.x, game.car.y)
+    benchmarks['draw_hud'] = game.draw_hud
+    
+    # Частицы: 500 штук, которые не угасают за время замера
+    particles = ParticleSystem(capacity=500, seed=0)
+    for kind in (SPARK, SMOKE, DEBRIS):
+        particles.emit(kind, 400, 300, 500)
+    particles.life[:] = 1e9
+    benchmarks['particles_update'] = lambda: particles.update(0.0)
+    benchmarks['particles_draw'] = lambda: particles.draw(screen)
+
+    def spawn():
+        if len(game.obstacles) > 1000:
+            game.obstacles.clear()
+        game.spawn_obstacle()
+    benchmarks['spawn_obstacle'] = spawn
+
+    # Замеры, зависящие от количества машин: машины едут с обычной скоростью
+    # в стороне от игрока, ушедшие за экран заменяются новыми сверху
+    def scaled_update(count, rng):
+        def run():
+            simulation.update_obstacles()
+            keep_filled(simulation, count, rng)
+        return run
+
+    def scaled_tick(count, rng):
+        def run():
+            simulation.update_playing(False, False, True, False)
+            keep_filled(simulation, count, rng)
+        return run
+
+    scaled = {
+        'update_obstacles': (simulation, scaled_update),
+        'check_collisions': (simulation, lambda count, rng: simulation.check_collisions),
+        'obstacles_draw': (game, lambda count, rng: lambda: game.obstacles.draw(screen)),
+        'headless_tick': (simulation, scaled_tick),
+    }
+
+    measured = {}
+    for name, func in benchmarks.items():
+        game.car.headlights_on = False
+        median, best = measure(func, number, repeat)
+        measured[name] = {'median_us': median, 'best_us': best}
+
+    for count in OBSTACLE_COUNTS:
+        for name, (target, make_func) in scaled.items():
+            target.reset_game(seed=0)
+            rng = fill_obstacles(target, count)
+            median, best = measure(make_func(count, rng), number, repeat)
+            if target.state != GameState.PLAYING:
+                raise RuntimeError(f"{name}[{count}]: замер задел столкновение")
+            measured[f'{name}[{count}]'] = {'median_us': median, 'best_us': best}
+
+    for result in measured.values():
+        result['ops_per_sec'] = 1e6 / result['median_us'] if result['median_us'] else 0.0
+    return measured
+
+
+def compare(results, baseline, threshold):
+    """Ищем замеры, которые стали медленнее эталона больше чем на threshold"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            continue
+        ratio = result['median_us'] / base['median_us'] if base['median_us'] else 1.0
+        result['baseline_us'] = base['median_us']
+        result['ratio'] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры скорости игры")
+    parser.add_argument("--number", type=int, default=200, help="вызовов в одном повторе")
+    parser.add_argument("--repeat", type=int, default=5, help="количество повторов")
+    parser.add_argument("--output", metavar="FILE", help="записать результаты в JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="эталон для сравнения")
+    parser.add_argument("--save-baseline", metavar="FILE", help="записать результаты как эталон")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="допустимое замедление относительно эталона (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Картинки и звуки ищутся относительно папки игры
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    results = run_benchmarks(args.number, args.repeat)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'number': args.number,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        report['regressions'] = regressions
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    if regressions:
+        print("Регрессия скорости: " + ", ".join(regressions), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
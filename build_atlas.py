@@ -0,0 +1,98 @@
+"""Сборка атласа спрайтов машин
+
+Все картинки машин (игрок и встречные) уменьшаются до игрового размера
+и укладываются в одну картинку. Игра читает один файл вместо нескольких
+и берёт спрайты кусками (subsurface) этой картинки.
+
+Запуск (после каждого изменения картинок в imgs/):
+    python build_atlas.py              # imgs/atlas.png + imgs/atlas.json
+    python build_atlas.py --width 256  # ширина атласа
+"""
+import os
+
+# Окно не нужно (до импорта pygame)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import json
+
+import pygame
+
+from assets import OBSTACLES_FOLDER, OBSTACLE_SIZE, ATLAS_IMAGE, ATLAS_INDEX, list_images
+from car import CAR_IMAGE, CAR_IMAGE_SIZE
+
+
+def collect_sprites():
+    """Что положить в атлас: ([(путь, размер)], [(папка, размер, пути)])"""
+    sprites = []
+    if os.path.exists(CAR_IMAGE):
+        sprites.append((CAR_IMAGE, CAR_IMAGE_SIZE))
+    paths = list_images(OBSTACLES_FOLDER)
+    sprites += [(path, OBSTACLE_SIZE) for path in paths]
+    return sprites, [(OBSTACLES_FOLDER, OBSTACLE_SIZE, paths)]
+
+
+def pack(sizes, max_width=512, padding=1):
+    """Раскладываем прямоугольники по полкам: (позиции, размер атласа)
+
+    Сначала высокие, каждая полка высотой с самый высокий спрайт на ней.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    positions = [None] * len(sizes)
+    x = y = shelf_height = width = 0
+    for i in order:
+        w, h = sizes[i]
+        if x and x + w > max_width:
+            # Полка заполнена - начинаем следующую
+            y += shelf_height + padding
+            x = shelf_height = 0
+        positions[i] = (x, y)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+        width = max(width, x - padding)
+    return positions, (width, y + shelf_height)
+
+
+def build(image_path=ATLAS_IMAGE, index_path=ATLAS_INDEX, max_width=512):
+    """Собираем атлас, возвращаем индекс"""
+    sprites, folders = collect_sprites()
+    images = []
+    for path, size in sprites:
+        images.append(pygame.transform.scale(pygame.image.load(path), size))
+
+    positions, atlas_size = pack([size for _, size in sprites], max_width)
+    atlas = pygame.Surface(atlas_size, pygame.SRCALPHA)
+    for image, position in zip(images, positions):
+        atlas.blit(image, position)
+    pygame.image.save(atlas, image_path)
+
+    index = {
+        'image': os.path.basename(image_path),
+        'sprites': [
+            {'path': path, 'size': list(size), 'rect': [x, y, size[0], size[1]]}
+            for (path, size), (x, y) in zip(sprites, positions)
+        ],
+        'folders': [
+            {'folder': folder, 'size': list(size), 'paths': paths}
+            for folder, size, paths in folders
+        ],
+    }
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сборка атласа спрайтов машин")
+    parser.add_argument("--width", type=int, default=512, help="максимальная ширина атласа")
+    args = parser.parse_args()
+
+    # Пути в индексе - относительно папки игры
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    index = build(max_width=args.width)
+    print(f"Атлас {ATLAS_IMAGE}: {len(index['sprites'])} спрайтов, индекс {ATLAS_INDEX}")
+
+
+if __name__ == "__main__":
+    main()
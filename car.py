@@ -1,12 +1,24 @@
 import pygame
-import numpy as np
+from assets import assets
+from audio import audio
+from lighting import lighting
+
+BEEP_SOUND_FILE = "sounds/beep2.wav"
+CAR_IMAGE = "imgs/result.png"
+CAR_IMAGE_SIZE = (80, 80)
 
 class Car:
     """Машинка игрока"""
     
-    def __init__(self, x, y, color=(255, 0, 0), number=777):
+    # Фиксированный набор полей - меньше памяти на объект
+    __slots__ = ('x', 'y', 'prev_x', 'color', 'number', 'image', 'width', 'height',
+                 'base_speed', 'current_speed', 'max_speed', 'min_speed',
+                 'acceleration', 'deceleration', 'beep_sound', 'headlights_on', 'mask')
+    
+    def __init__(self, x, y, color=(255, 0, 0), number=777, sound=True):
         self.x = x
         self.y = y
+        self.prev_x = x  # Позиция на прошлом шаге симуляции (для плавного рисования)
         self.color = color
         self.number = number
         self.image = None
@@ -21,54 +33,50 @@ class Car:
         self.acceleration = 0.3  # Ускорение
         self.deceleration = 0.5  # Торможение
         
-        pygame.mixer.init()
+        # Звук (в режиме симуляции без звука микшер не трогаем)
         self.beep_sound = None
-        self._load_sound()
+        if sound:
+            self._load_sound()
         
         self.headlights_on = False
         
-        # Пробуем загрузить картинку
+        # Пробуем загрузить картинку (через общий кэш - с диска один раз)
         try:
-            self.image = pygame.image.load("imgs/result.png")
-            self.image = pygame.transform.scale(self.image, (80, 80))
+            self.image = assets.get_image(CAR_IMAGE, CAR_IMAGE_SIZE)
         except:
             pass
+        
+        # Маска для точной проверки столкновений (из кэша - не строится заново)
+        if self.image:
+            self.mask = assets.get_mask(self.image)
+        else:
+            self.mask = assets.get_box_mask((self.width, self.height))
     
     def _load_sound(self):
-        """Загружаем звук сигнала"""
-        try:
-            self.beep_sound = pygame.mixer.Sound("sounds/beep2.wav")
-        except:
+        """Звук сигнала из общего кэша (файл читается один раз за игру)"""
+        self.beep_sound = audio.load(BEEP_SOUND_FILE)
+        if self.beep_sound is None:
             self._create_beep_sound()
     
     def _create_beep_sound(self):
-        """Создаём звук сигнала если нет файла"""
+        """Создаём звук сигнала если нет файла (тоже один раз, из кэша)"""
         try:
-            sample_rate = 22050
-            duration = 0.2
-            frequency = 500
-            
-            samples = np.sin(2 * np.pi * frequency * 
-                           np.linspace(0, duration, int(sample_rate * duration)))
-            samples = (samples * 32767).astype(np.int16)
-            stereo_samples = np.column_stack((samples, samples))
-            
-            self.beep_sound = pygame.sndarray.make_sound(stereo_samples)
+            self.beep_sound = audio.tone(500, 0.2)
         except:
             pass
     
-    def accelerate(self):
-        """Ускорение"""
-        self.current_speed = min(self.current_speed + self.acceleration, self.max_speed)
+    def accelerate(self, dt=1.0):
+        """Ускорение (dt - длина шага в кадрах при 60 FPS)"""
+        self.current_speed = min(self.current_speed + self.acceleration * dt, self.max_speed)
     
-    def brake(self):
+    def brake(self, dt=1.0):
         """Торможение"""
-        self.current_speed = max(self.current_speed - self.deceleration, self.min_speed)
+        self.current_speed = max(self.current_speed - self.deceleration * dt, self.min_speed)
     
-    def update_speed(self):
+    def update_speed(self, dt=1.0):
         """Обновление скорости (естественное замедление)"""
         if self.current_speed > self.min_speed:
-            self.current_speed -= 0.05
+            self.current_speed -= 0.05 * dt
             if self.current_speed < self.min_speed:
                 self.current_speed = self.min_speed
     
@@ -76,64 +84,65 @@ class Car:
         """Получить текущую скорость для передачи дороге"""
         return self.current_speed
     
-    def draw(self, screen):
-        """Рисуем машинку"""
+    def save_position(self):
+        """Запоминаем позицию перед шагом симуляции"""
+        self.prev_x = self.x
+    
+    def draw(self, screen, alpha=1.0):
+        """Рисуем машинку (alpha - доля между прошлым и текущим шагом)
+        
+        Возвращает прямоугольник, который был закрашен.
+        """
+        x = self.get_draw_x(alpha)
+        y = self.y
+        
         if self.image:
-            screen.blit(self.image, (self.x - 40, self.y - 40))
+            rect = screen.blit(self.image, (x - 40, y - 40))
         else:
-            self._draw_simple(screen)
+            rect = self._draw_simple(screen, x, y)
         
         if self.headlights_on:
-            self._draw_headlights(screen)
+            rect = rect.union(self._draw_headlights(screen, x, y))
+        return rect
     
-    def _draw_simple(self, screen):
+    def get_draw_x(self, alpha=1.0):
+        """Позиция для рисования между прошлым и текущим шагом"""
+        return self.prev_x + (self.x - self.prev_x) * alpha
+    
+    def _draw_simple(self, screen, x, y):
         """Простое рисование машинки"""
         pygame.draw.rect(screen, self.color, 
-                        (self.x - 25, self.y - 20, 50, 40))
+                        (x - 25, y - 20, 50, 40))
         
         dark = tuple(c // 2 for c in self.color)
         pygame.draw.rect(screen, dark, 
-                        (self.x - 20, self.y - 30, 40, 20))
+                        (x - 20, y - 30, 40, 20))
         
         black = (0, 0, 0)
-        pygame.draw.circle(screen, black, (self.x - 18, self.y - 15), 6)
-        pygame.draw.circle(screen, black, (self.x + 18, self.y - 15), 6)
-        pygame.draw.circle(screen, black, (self.x - 18, self.y + 15), 6)
-        pygame.draw.circle(screen, black, (self.x + 18, self.y + 15), 6)
+        pygame.draw.circle(screen, black, (x - 18, y - 15), 6)
+        pygame.draw.circle(screen, black, (x + 18, y - 15), 6)
+        pygame.draw.circle(screen, black, (x - 18, y + 15), 6)
+        pygame.draw.circle(screen, black, (x + 18, y + 15), 6)
         
         if self.headlights_on:
             light_color = (255, 255, 100)
         else:
             light_color = (255, 255, 0)
         
-        pygame.draw.circle(screen, light_color, (self.x, self.y - 25), 4)
+        pygame.draw.circle(screen, light_color, (x, y - 25), 4)
+        return pygame.Rect(x - 25, y - 30, 50, 60)
     
-    def _draw_headlights(self, screen):
-        """Рисуем свет от фар"""
-        light_color = (255, 255, 150, 60)
-        
-        points_left = [
-            (self.x - 10, self.y - 25),
-            (self.x - 60, self.y - 200),
-            (self.x + 10, self.y - 200)
-        ]
-        
-        points_right = [
-            (self.x + 10, self.y - 25),
-            (self.x - 10, self.y - 200),
-            (self.x + 60, self.y - 200)
-        ]
-        
-        pygame.draw.polygon(screen, light_color, points_left)
-        pygame.draw.polygon(screen, light_color, points_right)
+    def _draw_headlights(self, screen, x, y):
+        """Рисуем свет от фар (готовая картинка с прозрачностью)"""
+        return lighting.draw_headlights(screen, x, y)
     
-    def move_left(self, speed=5):
+    def move_left(self, speed=5, dt=1.0):
         """Движение влево"""
-        self.x -= speed
+        self.x -= speed * dt
     
-    def move_right(self, speed=5):
+    def move_right(self, speed=5, dt=1.0):
         """Движение вправо"""
-        self.x += speed
+        self.x += speed * dt
     
     def keep_on_road(self, left_edge, right_edge):
         """Не даём выехать за дорогу"""
@@ -145,7 +154,7 @@ class Car:
     def beep(self):
         """Сигналим!"""
         if self.beep_sound:
-            self.beep_sound.play()
+            audio.play(self.beep_sound, 'horn')
         else:
             print("БИП-БИП! 🚗")
     
@@ -154,8 +163,9 @@ class Car:
         self.headlights_on = not self.headlights_on
     
     def get_rect(self):
-        """Получаем прямоугольник для проверки столкновений"""
-        return pygame.Rect(self.x - 25, self.y - 25, 50, 50)
+        """Получаем прямоугольник для проверки столкновений (размером с маску)"""
+        width, height = self.mask.get_size()
+        return pygame.Rect(self.x - width // 2, self.y - height // 2, width, height)
 
 # ===== ДЕМО-РЕЖИМ =====
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+import math
+
+import numpy as np
+
+
+def _slab(p, v, half):
+    """Когда точка p + v*t находится внутри (-half, half): (вход, выход) по t"""
+    if v == 0:
+        # Нет движения по оси: внутри всё время или не бывает внутри вовсе
+        if abs(p) < half:
+            return -math.inf, math.inf
+        return math.inf, -math.inf
+    t1 = (-half - p) / v
+    t2 = (half - p) / v
+    return (t1, t2) if t1 < t2 else (t2, t1)
+
+
+def sweep_hits(store, x0, x1, y, width, height):
+    """Все машины, которые игрок задел за последний шаг: [(вход, выход, номер)]
+
+    Проверяется всё движение за шаг, а не только конечные положения:
+    игрок (прямоугольник width x height с центром на высоте y) сдвинулся
+    по x из x0 в x1, каждая машина - по y из prev_y в y. Поэтому быстрая
+    машина не проскочит сквозь игрока даже при редких шагах симуляции.
+    Сначала одной операцией над массивами отбираем машины, чья полоса
+    движения пересекает полосу игрока (линейный проход, но векторный -
+    быстрее пересборки сетки каждый шаг даже при тысячах машин), потом
+    точно (swept AABB) проверяем только их - обычно это одна-две машины.
+    Вход и выход - доли шага (0 - начало, 1 - конец), список отсортирован
+    по входу.
+    """
+    n = store.count
+    if n == 0:
+        return []
+    half_w = (width + store.width) / 2
+    half_h = (height + store.height) / 2
+    xs = store.x[:n]
+    y_start = store.prev_y[:n]
+    y_end = store.y[:n]
+
+    near = ((xs > min(x0, x1) - half_w) & (xs < max(x0, x1) + half_w) &
+            (np.minimum(y_start, y_end) < y + half_h) & (np.maximum(y_start, y_end) > y - half_h))
+
+    hits = []
+    for i in np.flatnonzero(near).tolist():
+        # Положение игрока относительно машины: p + v*t, t от 0 до 1 за шаг
+        start = float(y_start[i])
+        enter_x, leave_x = _slab(x0 - float(xs[i]), x1 - x0, half_w)
+        enter_y, leave_y = _slab(y - start, start - float(y_end[i]), half_h)
+        enter = max(enter_x, enter_y)
+        leave = min(leave_x, leave_y)
+        if enter < leave and enter < 1 and leave > 0:
+            hits.append((enter, leave, i))
+    hits.sort()
+    return hits
+
+
+def sweep_first_mask(store, car_mask, x0, x1, y, max_step=4):
+    """Первая машина, которую игрок задел за шаг, - по пикселям спрайтов (маскам)
+
+    Прямоугольники (размером с маски) отбирают машины, которых игрок
+    коснулся за шаг, а маски сравниваются только для них: в положениях
+    от входа до выхода, не реже чем через max_step пикселей сближения.
+    Маски берутся готовые (store.masks - одна на спрайт).
+    """
+    width, height = car_mask.get_size()
+    obstacle_w, obstacle_h = store.width, store.height
+    for enter, leave, i in sweep_hits(store, x0, x1, y, width, height):
+        mask = store.masks[store.sprite[i]]
+        ox = float(store.x[i])
+        y_start = float(store.prev_y[i])
+        dy = float(store.y[i]) - y_start
+        dx = x1 - x0
+        start = max(enter, 0.0)
+        end = min(leave, 1.0)
+        samples = math.ceil((abs(dx) + abs(dy)) * (end - start) / max_step)
+        for k in range(samples + 1):
+            t = start + (end - start) * k / samples if samples else end
+            # Смещение левого верхнего угла машины от угла игрока
+            offset = (int(ox - obstacle_w // 2) - int(x0 + dx * t - width // 2),
+                      int(y_start + dy * t - obstacle_h // 2) - int(y - height // 2))
+            if car_mask.overlap(mask, offset):
+                return i
+    return None
+
@@ -0,0 +1,92 @@
+import random
+
+import numpy as np
+import pygame
+
+
+class KeyboardController:
+    """Управление с клавиатуры: стрелки или WASD
+
+    Контроллер - любой объект с методом get_controls(game), который
+    возвращает (влево, вправо, газ, тормоз) на очередной шаг игры.
+    """
+
+    def get_controls(self, game):
+        keys = pygame.key.get_pressed()
+        return (
+            keys[pygame.K_LEFT] or keys[pygame.K_a],
+            keys[pygame.K_RIGHT] or keys[pygame.K_d],
+            keys[pygame.K_UP] or keys[pygame.K_w],
+            keys[pygame.K_DOWN] or keys[pygame.K_s],
+        )
+
+
+class PolicyController:
+    """Управление ботом: policy(game) -> (влево, вправо, газ, тормоз)"""
+
+    def __init__(self, policy):
+        self.policy = policy
+
+    def get_controls(self, game):
+        return self.policy(game)
+
+
+# ===== Боты =====
+
+class IdlePolicy:
+    """Ничего не нажимает"""
+
+    def __init__(self, seed=None):
+        pass
+
+    def __call__(self, game):
+        return ()
+
+
+class RandomPolicy:
+    """Случайное управление: каждые hold шагов выбираем новое"""
+
+    def __init__(self, seed=None, hold=15):
+        self.rng = random.Random(seed)
+        self.hold = hold
+        self.ticks = 0
+        self.controls = ()
+
+    def __call__(self, game):
+        if self.ticks % self.hold == 0:
+            rng = self.rng
+            steer = rng.random()
+            self.controls = (steer < 0.3, steer > 0.7, rng.random() < 0.5, rng.random() < 0.1)
+        self.ticks += 1
+        return self.controls
+
+
+class DodgePolicy:
+    """Уворачивается от ближайшей машины впереди, иначе разгоняется"""
+
+    def __init__(self, seed=None, lookahead=250):
+        self.lookahead = lookahead
+
+    def __call__(self, game):
+        car = game.car
+        store = game.obstacles
+        n = store.count
+        if n:
+            xs = store.x[:n]
+            ys = store.y[:n]
+            ahead = (ys < car.y) & (ys > car.y - self.lookahead) & (np.abs(xs - car.x) < 60)
+            if ahead.any():
+                # Ближайшая - с наибольшим y
+                nearest_x = xs[ahead][np.argmax(ys[ahead])]
+                room_left = car.x - game.road.get_left_edge()
+                room_right = game.road.get_right_edge() - car.x
+                go_left = nearest_x >= car.x if min(room_left, room_right) > 60 else room_left > room_right
+                return (go_left, not go_left, False, True)
+        return (False, False, True, False)
+
+
+POLICIES = {
+    'idle': IdlePolicy,
+    'random': RandomPolicy,
+    'dodge': DodgePolicy,
+}
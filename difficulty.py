@@ -0,0 +1,40 @@
+class Difficulty:
+    """Параметры сложности игры
+
+    Все формулы роста сложности в одном месте: игра берёт их отсюда,
+    а batch_sim.py перебирает разные значения параметров.
+    Время - в кадрах при 60 FPS, скорости - в пикселях за такой кадр.
+    """
+
+    def __init__(self, spawn_delay_start=120, spawn_delay_min=60, spawn_delay_per_point=2,
+                 obstacle_speed_bonus=2, obstacle_speed_per_point=0.1):
+        # Интервал появления машин: start - очки * per_point, но не меньше min
+        self.spawn_delay_start = spawn_delay_start
+        self.spawn_delay_min = spawn_delay_min
+        self.spawn_delay_per_point = spawn_delay_per_point
+        # Скорость встречной машины: скорость дороги + bonus + очки * per_point
+        self.obstacle_speed_bonus = obstacle_speed_bonus
+        self.obstacle_speed_per_point = obstacle_speed_per_point
+
+    def spawn_delay(self, score):
+        """Сколько ждать до следующей машины при таком счёте"""
+        return max(self.spawn_delay_min,
+                   self.spawn_delay_start - score * self.spawn_delay_per_point)
+
+    def obstacle_speed(self, road_speed, score):
+        """Скорость новой встречной машины"""
+        return road_speed + self.obstacle_speed_bonus + score * self.obstacle_speed_per_point
+
+    def as_dict(self):
+        """Параметры словарём (для отчётов и передачи в другие процессы)"""
+        return dict(vars(self))
+
+    def replace(self, **changes):
+        """Копия с изменёнными параметрами"""
+        params = self.as_dict()
+        params.update(changes)
+        return Difficulty(**params)
+
+    def __repr__(self):
+        params = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"Difficulty({params})"
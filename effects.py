@@ -0,0 +1,183 @@
+import numpy as np
+import pygame
+
+# Виды частиц
+SPARK = 0    # Искры
+SMOKE = 1    # Дым
+DEBRIS = 2   # Обломки
+
+# Параметры видов: скорость вылета, время жизни (в кадрах при 60 FPS),
+# гравитация, сопротивление воздуха, цвет и размер
+PARTICLE_KINDS = {
+    SPARK:  {'speed': (3.0, 8.0), 'life': (10, 25), 'gravity': 0.3,
+             'drag': 0.92, 'color': (255, 220, 80), 'size': 3},
+    SMOKE:  {'speed': (0.3, 1.5), 'life': (40, 70), 'gravity': -0.05,
+             'drag': 0.97, 'color': (90, 90, 90), 'size': 14},
+    DEBRIS: {'speed': (2.0, 5.0), 'life': (30, 50), 'gravity': 0.25,
+             'drag': 0.95, 'color': (40, 40, 40), 'size': 6},
+}
+FADE_LEVELS = 8  # Сколько готовых картинок на угасание одной частицы
+
+
+class ParticleSystem:
+    """Частицы (искры, дым, обломки) в массивах NumPy
+
+    Массивы выделяются один раз на capacity частиц: движение всех частиц -
+    несколько операций над массивами, рисование - один вызов blits с
+    готовыми картинками (по FADE_LEVELS на каждый вид). Если места нет,
+    новые частицы просто не появляются.
+    Случайность своя: частицы не влияют на игру и записи заездов.
+    """
+
+    def __init__(self, capacity=1024, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.life = np.ones(capacity, dtype=np.float32)
+        self.kind = np.zeros(capacity, dtype=np.uint8)
+
+        kinds = range(len(PARTICLE_KINDS))
+        self._gravity = np.array([PARTICLE_KINDS[k]['gravity'] for k in kinds], dtype=np.float32)
+        self._drag = np.array([PARTICLE_KINDS[k]['drag'] for k in kinds], dtype=np.float32)
+        self._rng = np.random.default_rng(seed)
+        self._sprites = None   # Картинки: вид * FADE_LEVELS + уровень угасания
+        self._half = None      # Половина размера каждой картинки (для центрирования)
+
+    def _columns(self):
+        return (self.x, self.y, self.vx, self.vy, self.age, self.life, self.kind)
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, kind, x, y, n, direction=0.0, spread=2 * np.pi):
+        """Выпускаем n частиц вида kind из точки (x, y)
+
+        direction - направление вылета (радианы, 0 - вправо, -pi/2 - вверх),
+        spread - ширина веера. Возвращает, сколько частиц поместилось.
+        """
+        n = min(n, self.capacity - self.count)
+        if n <= 0:
+            return 0
+        params = PARTICLE_KINDS[kind]
+        rng = self._rng
+        start, end = self.count, self.count + n
+
+        angles = direction + (rng.random(n) - 0.5) * spread
+        speeds = rng.uniform(*params['speed'], n)
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = np.cos(angles) * speeds
+        self.vy[start:end] = np.sin(angles) * speeds
+        self.age[start:end] = 0
+        self.life[start:end] = rng.uniform(*params['life'], n)
+        self.kind[start:end] = kind
+        self.count = end
+        return n
+
+    def update(self, dt=1.0):
+        """Двигаем все частицы и убираем угасшие (dt - длина шага в кадрах при 60 FPS)"""
+        n = self.count
+        if not n:
+            return
+        kind = self.kind[:n]
+        vx = self.vx[:n]
+        vy = self.vy[:n]
+        drag = self._drag[kind] ** dt
+        vx *= drag
+        vy *= drag
+        vy += self._gravity[kind] * dt
+        self.x[:n] += vx * dt
+        self.y[:n] += vy * dt
+        age = self.age[:n]
+        age += dt
+
+        # Угасшие частицы убираем, сдвигая живые к началу массивов
+        alive = age < self.life[:n]
+        if not alive.all():
+            k = int(np.count_nonzero(alive))
+            for column in self._columns():
+                column[:k] = column[:n][alive]
+            self.count = k
+
+    def _build_sprites(self):
+        """Рисуем картинки частиц один раз: для каждого вида - все стадии угасания"""
+        convert = pygame.display.get_surface() is not None
+        sprites = []
+        half = []
+        for kind in range(len(PARTICLE_KINDS)):
+            params = PARTICLE_KINDS[kind]
+            for level in range(FADE_LEVELS):
+                fade = level / FADE_LEVELS
+                alpha = int(255 * (1 - fade))
+                size = params['size']
+                if kind == SMOKE:
+                    size = int(size * (1 + fade))  # Дым расплывается
+                surface = pygame.Surface((size, size), pygame.SRCALPHA)
+                color = (*params['color'], alpha)
+                if kind == DEBRIS:
+                    surface.fill(color)
+                else:
+                    pygame.draw.circle(surface, color, (size // 2, size // 2), size // 2)
+                sprites.append(surface.convert_alpha() if convert else surface)
+                half.append(size // 2)
+        self._sprites = sprites
+        self._half = np.array(half, dtype=np.float32)
+
+    def draw(self, screen):
+        """Рисуем все частицы, возвращаем закрашенную область (или None)"""
+        n = self.count
+        if not n:
+            return None
+        if self._sprites is None:
+            self._build_sprites()
+
+        level = (self.age[:n] / self.life[:n] * FADE_LEVELS).astype(np.intp)
+        np.minimum(level, FADE_LEVELS - 1, out=level)
+        index = self.kind[:n] * FADE_LEVELS + level
+        half = self._half[index]
+        xs = (self.x[:n] - half).astype(np.int32)
+        ys = (self.y[:n] - half).astype(np.int32)
+
+        sprites = self._sprites
+        screen.blits(zip([sprites[i] for i in index.tolist()],
+                         zip(xs.tolist(), ys.tolist())), doreturn=False)
+
+        # Общая рамка всех частиц (для частичного обновления экрана)
+        size = int(half.max()) * 2 + 1
+        left, top = int(xs.min()), int(ys.min())
+        return pygame.Rect(left, top, int(xs.max()) - left + size, int(ys.max()) - top + size)
+
+    def clear(self):
+        """Убираем все частицы"""
+        self.count = 0
+
+
+class OverlayCache:
+    """Полупрозрачные заливки экрана (вспышки), создаются один раз"""
+
+    def __init__(self):
+        self._overlays = {}
+
+    def get(self, size, color, alpha):
+        """Заливка размера size цветом color с прозрачностью alpha"""
+        key = (size, tuple(color), alpha)
+        overlay = self._overlays.get(key)
+        if overlay is None:
+            overlay = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                overlay = overlay.convert()
+            overlay.fill(color)
+            overlay.set_alpha(alpha)
+            self._overlays[key] = overlay
+        return overlay
+
+    def clear(self):
+        self._overlays.clear()
+
+
+# Одни заливки на весь процесс
+overlays = OverlayCache()
@@ -0,0 +1,166 @@
+import random
+
+import numpy as np
+
+from game import Game
+from game_state import GameState
+
+# Действия: руль (ничего / влево / вправо) x педали (ничего / газ / тормоз)
+ACTIONS = tuple(
+    (steer == 1, steer == 2, pedal == 1, pedal == 2)
+    for steer in range(3)
+    for pedal in range(3)
+)
+
+SPEED_SCALE = 20.0  # Делитель скоростей в наблюдении (примерно максимальная скорость машин)
+
+
+class RacingEnv:
+    """Игра как среда для ботов (в духе gym): reset() и step(действие)
+
+    Действие - номер из ACTIONS или кортеж (влево, вправо, газ, тормоз).
+    Наблюдение - массив float32 длины observation_size:
+      [0] положение машины на дороге (-1 - левый край, 1 - правый),
+      [1] скорость машины (доля от максимальной),
+      дальше по 4 числа на каждую из nearest ближайших встречных машин
+      (есть ли машина, dx и dy относительно игрока, скорость), ближние - первыми.
+    Награда - очки, набранные за шаг, плюс crash_penalty при столкновении.
+    """
+
+    def __init__(self, nearest=4, max_steps=60 * 60 * 5, crash_penalty=-10.0,
+                 tick_rate=60, difficulty=None, seed=None, lanes=None):
+        self.game = Game(headless=True, tick_rate=tick_rate, seed=seed, difficulty=difficulty,
+                         lanes=lanes)
+        self.nearest = nearest
+        self.max_steps = max_steps
+        self.crash_penalty = crash_penalty
+        self.observation_size = 2 + 4 * nearest
+        self.action_count = len(ACTIONS)
+        self.steps = 0
+
+    def reset(self, seed=None, out=None):
+        """Новый заезд, возвращаем первое наблюдение"""
+        self.game.reset_game(seed)
+        self.steps = 0
+        return self.observe(out)
+
+    def step(self, action, out=None):
+        """Один шаг игры: (наблюдение, награда, заезд окончен, подробности)"""
+        game = self.game
+        controls = ACTIONS[action] if isinstance(action, (int, np.integer)) else action
+        score = game.score_manager.get_current_score()
+        game.update_playing(*controls)
+        self.steps += 1
+
+        new_score = game.score_manager.get_current_score()
+        reward = float(new_score - score)
+        crashed = game.state != GameState.PLAYING
+        if crashed:
+            reward += self.crash_penalty
+        done = crashed or self.steps >= self.max_steps
+        info = {
+            'score': new_score,
+            'steps': self.steps,
+            'crashed': crashed,
+            'cause': game.crash_cause,
+            'seed': game.run_seed,
+        }
+        return self.observe(out), reward, done, info
+
+    def observe(self, out=None):
+        """Наблюдение (в out, если передан - без создания нового массива)"""
+        if out is None:
+            out = np.empty(self.observation_size, dtype=np.float32)
+        game = self.game
+        car = game.car
+        left = game.road.get_left_edge()
+        half_width = (game.road.get_right_edge() - left) / 2
+
+        out[0] = (car.x - left - half_width) / half_width
+        out[1] = car.get_speed() / car.max_speed
+
+        obstacles = out[2:].reshape(self.nearest, 4)
+        obstacles[:] = 0
+        store = game.obstacles
+        n = store.count
+        if n:
+            dx = store.x[:n] - car.x
+            dy = store.y[:n] - car.y
+            distance = dx * dx + dy * dy
+            k = min(n, self.nearest)
+            if n > k:
+                nearest = np.argpartition(distance, k - 1)[:k]
+            else:
+                nearest = np.arange(n)
+            nearest = nearest[np.argsort(distance[nearest])]
+            obstacles[:k, 0] = 1
+            obstacles[:k, 1] = dx[nearest] / half_width
+            obstacles[:k, 2] = dy[nearest] / game.height
+            obstacles[:k, 3] = store.speed[nearest] / SPEED_SCALE
+        return out
+
+
+class VectorRacingEnv:
+    """Несколько независимых игр, которые делают шаг одновременно
+
+    step(действия) принимает по действию на игру и возвращает массивы
+    наблюдений (число игр x observation_size), наград и флагов конца заезда.
+    Закончившийся заезд сразу начинается заново со следующим зерном,
+    последнее наблюдение старого заезда - в infos[i]['final_observation'].
+    Возвращаемые массивы переиспользуются на следующем шаге.
+    """
+
+    def __init__(self, num_envs, seed=0, **kwargs):
+        self.envs = [RacingEnv(**kwargs) for _ in range(num_envs)]
+        self.num_envs = num_envs
+        self.observation_size = self.envs[0].observation_size
+        self.action_count = self.envs[0].action_count
+        self.seed_source = random.Random(seed)  # Зёрна заездов
+        self.observations = np.zeros((num_envs, self.observation_size), dtype=np.float32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+
+    def reset(self):
+        """Новые заезды во всех играх"""
+        for i, env in enumerate(self.envs):
+            env.reset(self.seed_source.getrandbits(32), out=self.observations[i])
+        return self.observations
+
+    def step(self, actions):
+        """Шаг всех игр: (наблюдения, награды, конец заезда, подробности)"""
+        infos = []
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            observation = self.observations[i]
+            _, reward, done, info = env.step(action, out=observation)
+            if done:
+                info['final_observation'] = observation.copy()
+                env.reset(self.seed_source.getrandbits(32), out=observation)
+            self.rewards[i] = reward
+            self.dones[i] = done
+            infos.append(info)
+        return self.observations, self.rewards, self.dones, infos
+
+
+# ===== ДЕМО-РЕЖИМ =====
+if __name__ == "__main__":
+    """Демонстрация: 16 игр со случайными действиями, скорость в шагах в секунду"""
+
+    import time
+
+    env = VectorRacingEnv(16, seed=0)
+    env.reset()
+    rng = np.random.default_rng(0)
+    finished = []
+
+    start = time.perf_counter()
+    steps = 2000
+    for _ in range(steps):
+        actions = rng.integers(env.action_count, size=env.num_envs)
+        observations, rewards, dones, infos = env.step(actions)
+        finished += [info['score'] for info, done in zip(infos, dones) if done]
+    elapsed = time.perf_counter() - start
+
+    print(f"Наблюдение: {env.observation_size} чисел, действий: {env.action_count}")
+    print(f"{steps * env.num_envs} шагов за {elapsed:.2f} с "
+          f"({steps * env.num_envs / elapsed:.0f} шагов/с, {steps * env.num_envs / elapsed * 3600 / 1e6:.1f} млн/час)")
+    print(f"Заездов закончено: {len(finished)}, средний счёт: {np.mean(finished) if finished else 0:.1f}")
@@ -1,113 +1,299 @@
 import pygame
 import sys
+import gc
+import math
+import time
 import random
 from road import Road
-from car import Car
-from obstacle import ObstacleCar
+from car import Car, BEEP_SOUND_FILE, CAR_IMAGE, CAR_IMAGE_SIZE
+from obstacle_store import ObstacleStore
+from traffic import LaneTraffic
+from collision import sweep_first_mask
+from assets import assets, OBSTACLES_FOLDER, OBSTACLE_SIZE
+from loader import AssetLoader
+from audio import audio
+from lighting import lighting
+from effects import ParticleSystem, overlays, SPARK, SMOKE, DEBRIS
+from text_cache import text_cache, HudLabel
+from profiler import FrameProfiler, NullProfiler, StartupTimer
+from replay import ReplayRecorder, ReplayPlayer
+from leaderboard import Leaderboard
 from score_manager import ScoreManager
 from game_state import GameState
+from difficulty import Difficulty
+from controllers import KeyboardController
+
+# Шрифт интерфейса: None - шрифт, встроенный в pygame (без поиска системных шрифтов)
+FONT_FILE = None
+
+# Ограничение FPS по умолчанию (для монитора 144 Гц - Game(max_fps=144) или --max-fps 144)
+DEFAULT_MAX_FPS = 60
 
 class Game:
     """Главный класс игры"""
     
-    def __init__(self, width=800, height=600):
-        pygame.init()
+    def __init__(self, width=800, height=600, headless=False, tick_rate=60, max_fps=None,
+                 dirty_rects=False, dirty_threshold=0.5, profile=False, trace_file=None,
+                 seed=None, record_file=None, player_name="ИГРОК",
+                 leaderboard_file="leaderboard.db", night=False, startup=None, difficulty=None,
+                 controller=None, lanes=None):
+        # Замер времени запуска (если таймер передали - печатаем отчёт после загрузки)
+        self.startup = startup if startup is not None else StartupTimer()
+        self.print_startup = startup is not None
+        
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption("🏁 ГОНКИ")
+        # headless - режим симуляции: без окна, звука и ограничения FPS
+        self.headless = headless
+        
+        # Фиксированный шаг симуляции: логика идёт tick_rate раз в секунду,
+        # а рисование - не чаще max_fps кадров в секунду (None - DEFAULT_MAX_FPS,
+        # 0 - без ограничения, занимает ядро процессора целиком).
+        # Все скорости в игре заданы "за кадр при 60 FPS", поэтому шаг
+        # в этих единицах равен 60 / tick_rate.
+        self.tick_rate = tick_rate
+        if headless:
+            max_fps = 0
+        elif max_fps is None:
+            max_fps = DEFAULT_MAX_FPS
+        self.max_fps = max_fps
+        self.dt = 60 / tick_rate
+        
+        # Частичное обновление экрана: во время игры перерисовываем и выводим
+        # только изменившиеся области. Если изменилось больше dirty_threshold
+        # от площади экрана - обычный flip целиком.
+        self.dirty_rects = dirty_rects
+        self.dirty_threshold = dirty_threshold
+        self.prev_dirty = []       # Что рисовали на прошлом кадре (надо стереть)
+        self.full_redraw = True    # Следующий кадр нарисовать целиком
+        
+        # Ночной режим: сцена затемнена, видно только то, что освещают фары
+        self.night = night
+        
+        # Случайность только через свой генератор: заезд с тем же зерном
+        # и тем же управлением повторяется в точности
+        self.seed_source = random.Random(seed)  # Зёрна для каждого заезда
+        self.rng = random.Random()
+        self.run_seed = None
+        
+        # Откуда берётся управление: клавиатура или бот (см. controllers.py)
+        self.controller = controller if controller is not None else KeyboardController()
+        
+        # Запись заезда в файл и воспроизведение записи
+        self.recorder = ReplayRecorder(record_file) if record_file else None
+        self.replay_player = None
+        
+        # Профилировщик кадра (F3 - показать таблицу времени фаз).
+        # trace_file - куда записать покадровые замеры при выходе (.csv или .json)
+        if profile or trace_file:
+            self.profiler = FrameProfiler(trace_file=trace_file)
+        else:
+            self.profiler = NullProfiler()
+        
+        if headless:
+            self.screen = None
+        else:
+            # Включаем только то, что нужно игре: окно, шрифты и звук
+            # (pygame.init() запускал бы ещё джойстики и прочее)
+            audio.configure()
+            pygame.display.init()
+            pygame.font.init()
+            audio.init()
+            self.screen = pygame.display.set_mode((width, height))
+            pygame.display.set_caption("🏁 ГОНКИ")
         self.clock = pygame.time.Clock()
+        self.startup.mark("display")
+        
+        # Дорога нужна сразу, машины и спрайты - только для игры:
+        # пока открыто меню, они читаются с диска в фоновых потоках,
+        # а в кэш переносятся порциями не дольше loading_budget мс за кадр
+        # lanes - режим полос: машины едут по полосам (None - где угодно на дороге)
+        self.lanes = lanes
+        self.road = Road(width, height, lanes=lanes or 2)
+        self.car = None
+        self.obstacles = None
+        self.traffic = None
+        self.loaded = False
+        self.loading_budget = 4
+        if headless:
+            self.loader = None
+        else:
+            self.loader = AssetLoader()
+            # Все машины одной картинкой из атласа (если он собран)
+            if not self.loader.add_atlas():
+                self.loader.add_image(CAR_IMAGE, CAR_IMAGE_SIZE)
+                self.loader.add_folder(OBSTACLES_FOLDER, OBSTACLE_SIZE)
+            self.loader.add_sound(BEEP_SOUND_FILE)
+        # Искры, дым и обломки (только для красоты, в симуляции не считаем)
+        self.particles = ParticleSystem()
+        # В симуляции рекорд не сохраняем в файл
+        self.score_manager = ScoreManager(None if headless else "highscore.json")
         
-        # Создаём объекты
-        self.road = Road(width, height)
-        self.car = Car(width // 2, height - 100)
-        self.obstacles = []
-        self.score_manager = ScoreManager()
+        # Таблица лидеров: все заезды (в симуляции не ведём)
+        self.player_name = player_name
+        if headless or not leaderboard_file:
+            self.leaderboard = None
+        else:
+            self.leaderboard = Leaderboard(leaderboard_file)
+        self.last_run = None      # Результат последнего заезда: (место, процентиль, всего)
+        self.run_ticks = 0        # Длительность заезда в шагах
+        self.max_speed_reached = 0
         
         # Состояние игры
         self.state = GameState.MENU
         
-        # Параметры генерации препятствий
+        # Параметры генерации препятствий (формулы сложности - в difficulty.py)
+        self.difficulty = difficulty if difficulty is not None else Difficulty()
         self.obstacle_spawn_timer = 0
-        self.obstacle_spawn_delay = 120  # Кадров между появлением машин
+        self.obstacle_spawn_delay = self.difficulty.spawn_delay(0)  # Кадров (при 60 FPS) между появлением машин
         
         # Анимация столкновения
         self.crash_timer = 0
-        self.crash_duration = 60  # Кадров анимации
+        self.crash_duration = 60  # Кадров анимации (при 60 FPS)
         self.crash_flash = 0
+        self.crash_cause = None
+        self.crash_index = None   # Машина, с которой столкнулись
         
-        # Шрифты
-        self.font_small = pygame.font.SysFont(None, 24)
-        self.font_medium = pygame.font.SysFont(None, 36)
-        self.font_large = pygame.font.SysFont(None, 72)
+        # Шрифты (в симуляции ничего не рисуем)
+        if not headless:
+            self.font_small = pygame.font.Font(FONT_FILE, 24)
+            self.font_medium = pygame.font.Font(FONT_FILE, 36)
+            self.font_large = pygame.font.Font(FONT_FILE, 72)
+            
+            # Надписи интерфейса перерисовываются только при смене значения
+            self.hud_labels = [
+                HudLabel(self.font_medium, "ОЧКИ: {}", (255, 255, 255),
+                         self.score_manager.get_current_score, (10, 10)),
+                HudLabel(self.font_small, "РЕКОРД: {}", (255, 255, 0),
+                         self.score_manager.get_high_score, (10, 50)),
+                HudLabel(self.font_small, "СКОРОСТЬ: {} км/ч", (200, 200, 200),
+                         lambda: int(self.car.get_speed()) * 10, (10, 80)),
+            ]
+        self.startup.mark("game_init")
+        
+        # В симуляции меню нет - загружаем всё сразу
+        if headless:
+            self.load_game_assets()
+    
+    def load_game_assets(self):
+        """Загружаем всё, что нужно для заезда (один раз)"""
+        if self.loaded:
+            return
+        # Дожидаемся фоновой загрузки (если она ещё идёт)
+        if self.loader:
+            self.loader.finish()
+        # Спрайты заранее, чтобы появление машин не читало диск
+        assets.warm_up()
+        if not self.headless:
+            audio.preload([BEEP_SOUND_FILE])
+        self.car = self._create_car()
+        self.obstacles = ObstacleStore()
+        if self.lanes:
+            self.traffic = LaneTraffic(self.road, self.obstacles)
+        self.loaded = True
+        self.startup.mark("game_assets")
+    
+    def _create_car(self):
+        """Создаём машину игрока (в симуляции - без звука)"""
+        return Car(self.width // 2, self.height - 100, sound=not self.headless)
     
-    def reset_game(self):
-        """Сброс игры для новой попытки"""
-        self.car = Car(self.width // 2, self.height - 100)
-        self.obstacles = []
+    def reset_game(self, seed=None):
+        """Сброс игры для новой попытки (seed - зерно случайности заезда)"""
+        if seed is None:
+            seed = self.seed_source.getrandbits(32)
+        self.run_seed = seed
+        self.rng.seed(seed)
+        
+        self.load_game_assets()
+        self.car = self._create_car()
+        self.obstacles.clear()
+        if self.traffic:
+            self.traffic.invalidate()
         self.score_manager.reset_current_score()
         self.obstacle_spawn_timer = 0
+        self.obstacle_spawn_delay = self.difficulty.spawn_delay(0)
         self.crash_timer = 0
+        self.crash_flash = 0
+        self.crash_cause = None
+        self.particles.clear()
         self.state = GameState.PLAYING
+        self.run_ticks = 0
+        self.max_speed_reached = 0
+        
+        self.replay_player = None
+        if self.recorder:
+            self.recorder.start(seed, self.tick_rate, self.lanes or 0)
+    
+    def start_replay(self, replay):
+        """Начинаем воспроизведение записанного заезда"""
+        self.reset_game(replay.seed)
+        self.replay_player = ReplayPlayer(replay)
     
     def spawn_obstacle(self):
-        """Создаём новую встречную машину"""
+        """Создаём новую встречную машину (False - по полосам сейчас некуда)"""
+        y = -50
+        
+        # Скорость увеличивается с очками
+        speed = self.difficulty.obstacle_speed(
+            self.road.get_current_speed(),
+            self.score_manager.get_current_score()
+        )
+        
+        if self.traffic:
+            # По полосам: с зазором до машины впереди и не во все полосы сразу
+            lane = self.traffic.pick_lane(y, self.rng)
+            if lane is None:
+                return False
+            self.traffic.spawn(lane, y, speed, rng=self.rng)
+            return True
+        
         # Определяем границы дороги
         left_edge = self.road.get_left_edge()
         right_edge = self.road.get_right_edge()
         
         # Случайная позиция на дороге
-        x = random.randint(left_edge + 40, right_edge - 40)
-        y = -50
-        
-        # Скорость увеличивается с очками
-        base_speed = self.road.get_current_speed() + 2
-        bonus_speed = self.score_manager.get_current_score() * 0.1
-        speed = base_speed + bonus_speed
-        
-        obstacle = ObstacleCar(x, y, speed)
-        self.obstacles.append(obstacle)
+        x = self.rng.randint(left_edge + 40, right_edge - 40)
+        self.obstacles.spawn(x, y, speed, rng=self.rng)
+        return True
     
     def update_obstacles(self):
-        """Обновление всех препятствий"""
-        for obstacle in self.obstacles[:]:
-            obstacle.update()
-            
-            # Удаляем машины, вышедшие за экран
-            if obstacle.is_off_screen(self.height):
-                # Начисляем очко если прошли мимо
-                if not obstacle.passed:
-                    self.score_manager.add_score(1)
-                    obstacle.passed = True
-                self.obstacles.remove(obstacle)
+        """Обновление всех препятствий (сразу всем массивом)"""
+        # Двигаем машины и удаляем вышедшие за экран
+        if self.traffic:
+            passed = self.traffic.update(self.height, self.dt)
+        else:
+            passed = self.obstacles.update(self.height, self.dt)
+        
+        # Начисляем очко за каждую машину, которую прошли мимо
+        if passed:
+            self.score_manager.add_score(passed)
     
     def check_collisions(self):
-        """Проверка столкновений"""
-        car_rect = self.car.get_rect()
-        
-        for obstacle in self.obstacles:
-            obstacle_rect = obstacle.get_rect()
-            if car_rect.colliderect(obstacle_rect):
-                return True
-        return False
+        """Проверка столкновений за весь шаг (при любой частоте симуляции)
+
+        Сначала прямоугольники, потом - по пикселям спрайтов (готовые маски).
+        """
+        car = self.car
+        self.crash_index = sweep_first_mask(self.obstacles, car.mask, car.prev_x, car.x, car.y)
+        return self.crash_index is not None
     
     def draw_menu(self):
         """Рисуем главное меню"""
         self.screen.fill((0, 100, 0))
         
         # Заголовок
-        title = self.font_large.render("ГОНКИ", True, (255, 255, 255))
+        title = text_cache.render(self.font_large, "ГОНКИ", (255, 255, 255))
         title_rect = title.get_rect(center=(self.width // 2, self.height // 3))
         self.screen.blit(title, title_rect)
         
         # Рекорд
         record_text = f"РЕКОРД: {self.score_manager.get_high_score()}"
-        record = self.font_medium.render(record_text, True, (255, 255, 0))
+        record = text_cache.render(self.font_medium, record_text, (255, 255, 0))
         record_rect = record.get_rect(center=(self.width // 2, self.height // 2))
         self.screen.blit(record, record_rect)
         
         # Подсказка
-        hint = self.font_small.render("Нажмите ENTER или ПРОБЕЛ чтобы начать", True, (200, 200, 200))
+        hint = text_cache.render(self.font_small, "Нажмите ENTER или ПРОБЕЛ чтобы начать", (200, 200, 200))
         hint_rect = hint.get_rect(center=(self.width // 2, self.height * 2 // 3))
         self.screen.blit(hint, hint_rect)
         
@@ -116,188 +302,506 @@ class Game:
             "УПРАВЛЕНИЕ:",
             "← A - Влево  |  → D - Вправо",
             "↑ W - Ускорение  |  ↓ S - Торможение",
-            "SPACE - Сигнал  |  E - Фары"
+            "SPACE - Сигнал  |  E - Фары  |  N - Ночь"
         ]
         
         y_offset = self.height * 3 // 4
         for text in controls:
-            surface = self.font_small.render(text, True, (255, 255, 255))
+            surface = text_cache.render(self.font_small, text, (255, 255, 255))
             rect = surface.get_rect(center=(self.width // 2, y_offset))
             self.screen.blit(surface, rect)
             y_offset += 25
+        
+        # Фоновая загрузка ещё идёт
+        if not self.loaded:
+            percent = int(self.loader.progress() * 100)
+            loading = text_cache.render(self.font_small, f"Загрузка: {percent}%", (200, 200, 200))
+            self.screen.blit(loading, (10, self.height - 30))
+    
+    def draw_loading(self):
+        """Рисуем экран загрузки с полосой прогресса"""
+        self.screen.fill((0, 100, 0))
+        
+        title = text_cache.render(self.font_medium, "ЗАГРУЗКА...", (255, 255, 255))
+        title_rect = title.get_rect(center=(self.width // 2, self.height // 2 - 40))
+        self.screen.blit(title, title_rect)
+        
+        # Полоса прогресса
+        bar = pygame.Rect(0, 0, self.width // 2, 20)
+        bar.center = (self.width // 2, self.height // 2 + 10)
+        pygame.draw.rect(self.screen, (255, 255, 255), bar, 2)
+        filled = bar.inflate(-6, -6)
+        filled.width = int(filled.width * self.loader.progress())
+        pygame.draw.rect(self.screen, (255, 255, 0), filled)
+    
+    def update_loading(self):
+        """Переносим загруженное в кэш (один кадр), по окончании - готовим игру"""
+        self.loader.step(self.loading_budget)
+        if not self.loader.done():
+            return
+        self.load_game_assets()
+        # Всё, что создано при запуске, живёт до конца игры
+        gc.collect()
+        gc.freeze()
+        if self.state == GameState.LOADING:
+            self.reset_game()
     
     def draw_game_over(self):
         """Рисуем экран окончания игры"""
         self.screen.fill((50, 50, 50))
         
         # Заголовок
-        title = self.font_large.render("GAME OVER", True, (255, 50, 50))
+        title = text_cache.render(self.font_large, "GAME OVER", (255, 50, 50))
         title_rect = title.get_rect(center=(self.width // 2, self.height // 4))
         self.screen.blit(title, title_rect)
         
         # Счёт
         score_text = f"ОЧКИ: {self.score_manager.get_current_score()}"
-        score = self.font_medium.render(score_text, True, (255, 255, 255))
+        score = text_cache.render(self.font_medium, score_text, (255, 255, 255))
         score_rect = score.get_rect(center=(self.width // 2, self.height // 2 - 40))
         self.screen.blit(score, score_rect)
         
         # Рекорд
         record_text = f"РЕКОРД: {self.score_manager.get_high_score()}"
-        record = self.font_medium.render(record_text, True, (255, 255, 0))
+        record = text_cache.render(self.font_medium, record_text, (255, 255, 0))
         record_rect = record.get_rect(center=(self.width // 2, self.height // 2 + 10))
         self.screen.blit(record, record_rect)
         
         # Новый рекорд!
         if self.score_manager.is_new_record():
-            new_record = self.font_medium.render("★ НОВЫЙ РЕКОРД! ★", True, (255, 215, 0))
+            new_record = text_cache.render(self.font_medium, "★ НОВЫЙ РЕКОРД! ★", (255, 215, 0))
             new_record_rect = new_record.get_rect(center=(self.width // 2, self.height // 2 + 60))
             self.screen.blit(new_record, new_record_rect)
         
+        # Место в таблице лидеров
+        if self.last_run:
+            rank, percentile, total = self.last_run
+            rank_text = f"МЕСТО: {rank} из {total} (лучше {percentile:.0f}% заездов)"
+            rank_surface = text_cache.render(self.font_small, rank_text, (200, 200, 255))
+            rank_rect = rank_surface.get_rect(center=(self.width // 2, self.height // 2 + 95))
+            self.screen.blit(rank_surface, rank_rect)
+        
+        # Лучшие заезды
+        if self.leaderboard:
+            y_offset = self.height // 4 + 50
+            x = self.width - 190
+            top_title = text_cache.render(self.font_small, "ЛУЧШИЕ:", (255, 215, 0))
+            self.screen.blit(top_title, (x, y_offset))
+            for i, run in enumerate(self.leaderboard.top(5), 1):
+                y_offset += 25
+                line = text_cache.render(self.font_small, f"{i}. {run.player} - {run.score}", (255, 255, 255))
+                self.screen.blit(line, (x, y_offset))
+        
         # Подсказка
-        hint = self.font_small.render("Нажмите ENTER или ПРОБЕЛ для новой игры", True, (200, 200, 200))
+        hint = text_cache.render(self.font_small, "Нажмите ENTER или ПРОБЕЛ для новой игры", (200, 200, 200))
         hint_rect = hint.get_rect(center=(self.width // 2, self.height * 3 // 4))
         self.screen.blit(hint, hint_rect)
         
-        hint2 = self.font_small.render("ESC - Выход в меню", True, (200, 200, 200))
+        hint2 = text_cache.render(self.font_small, "ESC - Выход в меню", (200, 200, 200))
         hint2_rect = hint2.get_rect(center=(self.width // 2, self.height * 3 // 4 + 30))
         self.screen.blit(hint2, hint2_rect)
     
-    def draw_crash_animation(self):
+    def draw_crash_animation(self, alpha=1.0):
         """Простая анимация столкновения - мигание"""
         # Рисуем обычную сцену
-        self.road.draw(self.screen)
-        for obstacle in self.obstacles:
-            obstacle.draw(self.screen)
-        
-        # Мигание красным
-        if self.crash_flash % 10 < 5:
-            overlay = pygame.Surface((self.width, self.height))
-            overlay.set_alpha(100)
-            overlay.fill((255, 0, 0))
+        self.road.draw(self.screen, alpha)
+        self.obstacles.draw(self.screen, alpha)
+        self.draw_night(alpha)
+        
+        # Мигание красным (заливка создаётся один раз)
+        if int(self.crash_flash) % 10 < 5:
+            overlay = overlays.get((self.width, self.height), (255, 0, 0), 100)
             self.screen.blit(overlay, (0, 0))
         
-        self.car.draw(self.screen)
+        self.car.draw(self.screen, alpha)
+        self.particles.draw(self.screen)
         
         # Текст "СТОЛКНОВЕНИЕ!"
-        crash_text = self.font_large.render("CRASH!", True, (255, 255, 255))
+        crash_text = text_cache.render(self.font_large, "CRASH!", (255, 255, 255))
         crash_rect = crash_text.get_rect(center=(self.width // 2, self.height // 2))
         self.screen.blit(crash_text, crash_rect)
     
     def draw_hud(self):
-        """Рисуем интерфейс во время игры"""
-        # Текущие очки
-        score_text = f"ОЧКИ: {self.score_manager.get_current_score()}"
-        score_surface = self.font_medium.render(score_text, True, (255, 255, 255))
-        self.screen.blit(score_surface, (10, 10))
+        """Рисуем интерфейс во время игры, возвращаем закрашенные области"""
+        # Очки, рекорд и скорость
+        return [label.draw(self.screen) for label in self.hud_labels]
+    
+    def draw_night(self, alpha=1.0):
+        """Ночью затемняем сцену вокруг света фар"""
+        if self.night:
+            lighting.draw_night(self.screen, self.car.get_draw_x(alpha), self.car.y,
+                                self.car.headlights_on)
+    
+    def handle_event(self, event):
+        """Обработка одного события. Возвращает False, если пора выходить"""
+        if event.type == pygame.QUIT:
+            return False
         
-        # Рекорд
-        record_text = f"РЕКОРД: {self.score_manager.get_high_score()}"
-        record_surface = self.font_small.render(record_text, True, (255, 255, 0))
-        self.screen.blit(record_surface, (10, 50))
+        if event.type == pygame.KEYDOWN:
+            # Таблица профилировщика (в любом состоянии)
+            if event.key == pygame.K_F3:
+                self.profiler.toggle_overlay()
+                # Таблица рисуется поверх - после её скрытия перерисовываем всё
+                self.full_redraw = True
+            # День / ночь
+            if event.key == pygame.K_n:
+                self.night = not self.night
+                self.full_redraw = True
+            
+            # Меню - начать игру
+            if self.state == GameState.MENU:
+                if event.key in [pygame.K_RETURN, pygame.K_SPACE]:
+                    if self.loaded:
+                        self.reset_game()
+                    else:
+                        # Ещё не всё загружено - показываем прогресс
+                        self.state = GameState.LOADING
+            
+            # Game Over - начать заново или выйти в меню
+            elif self.state == GameState.GAME_OVER:
+                if event.key in [pygame.K_RETURN, pygame.K_SPACE]:
+                    self.reset_game()
+                elif event.key == pygame.K_ESCAPE:
+                    self.state = GameState.MENU
+            
+            # Во время игры
+            elif self.state == GameState.PLAYING:
+                if event.key == pygame.K_SPACE:
+                    self.car.beep()
+                if event.key == pygame.K_e:
+                    self.car.toggle_headlights()
+        return True
+    
+    def update_playing(self, left=False, right=False, accelerate=False, brake=False):
+        """Один шаг игровой логики (без рисования)"""
+        dt = self.dt
+        profiler = self.profiler
+        
+        with profiler.section("input"):
+            self.car.save_position()
+            
+            # Управление
+            if left:
+                self.car.move_left(dt=dt)
+            if right:
+                self.car.move_right(dt=dt)
+            if accelerate:
+                self.car.accelerate(dt)
+            if brake:
+                self.car.brake(dt)
+        
+        with profiler.section("update"):
+            # Обновление
+            self.car.update_speed(dt)
+            self.run_ticks += 1
+            self.max_speed_reached = max(self.max_speed_reached, self.car.get_speed())
+            self.road.update(self.car.get_speed(), dt)
+            x = self.car.x
+            self.car.keep_on_road(
+                self.road.get_left_edge(),
+                self.road.get_right_edge()
+            )
+            if not self.headless:
+                # Машина трётся об обочину - искры
+                if self.car.x != x:
+                    side = 1 if x > self.car.x else -1
+                    self.particles.emit(SPARK, self.car.x + side * 25, self.car.y,
+                                        2, math.pi / 2, math.pi / 2)
+                self.particles.update(dt)
+            
+            # Генерация препятствий
+            self.obstacle_spawn_timer += dt
+            # (если по полосам некуда - пробуем снова на следующем шаге)
+            if self.obstacle_spawn_timer >= self.obstacle_spawn_delay and self.spawn_obstacle():
+                self.obstacle_spawn_timer = 0
+                # Уменьшаем задержку с ростом очков (усложняем игру)
+                self.obstacle_spawn_delay = self.difficulty.spawn_delay(
+                    self.score_manager.get_current_score()
+                )
+        
+        with profiler.section("obstacles"):
+            self.update_obstacles()
+        
+        # Проверка столкновений
+        with profiler.section("collisions"):
+            crashed = self.check_collisions()
+        if crashed:
+            self.state = GameState.CRASH
+            self.crash_timer = 0
+            self.crash_flash = 0
+            self.crash_cause = self.get_crash_cause()
+            if not self.headless:
+                self.emit_crash()
+    
+    def get_crash_cause(self):
+        """Как произошло столкновение: 'front' - машина впереди, 'left'/'right' - сбоку"""
+        index = self.crash_index
+        if index is None:
+            return None
+        dx = self.obstacles.x[index] - self.car.x
+        # Машины перекрываются больше чем на половину ширины - удар спереди
+        if abs(dx) < (self.car.get_rect().width + self.obstacles.width) / 4:
+            return 'front'
+        return 'left' if dx < 0 else 'right'
+    
+    def emit_crash(self):
+        """Взрыв частиц в месте удара (перед машиной игрока)"""
+        x, y = self.car.x, self.car.y - 25
+        self.particles.emit(SPARK, x, y, 40)
+        self.particles.emit(DEBRIS, x, y, 20)
+        self.particles.emit(SMOKE, x, y, 10, -math.pi / 2, math.pi / 2)
+    
+    def update_crash(self):
+        """Один шаг анимации столкновения"""
+        self.crash_timer += self.dt
+        self.crash_flash += self.dt
+        if not self.headless:
+            # Из разбитой машины идёт дым
+            self.particles.emit(SMOKE, self.car.x, self.car.y - 20, 1, -math.pi / 2, math.pi / 3)
+            self.particles.update(self.dt)
+        
+        if self.crash_timer >= self.crash_duration:
+            # Сохраняем рекорд
+            self.score_manager.save_high_score()
+            self.record_run()
+            self.state = GameState.GAME_OVER
+    
+    def record_run(self):
+        """Добавляем заезд в таблицу лидеров и запоминаем его место"""
+        if self.leaderboard is None or self.replay_player:
+            return
+        score = self.score_manager.get_current_score()
+        self.leaderboard.record_run(
+            self.player_name,
+            score,
+            self.run_ticks / self.tick_rate,
+            self.max_speed_reached,
+            self.run_seed
+        )
+        self.last_run = (
+            self.leaderboard.rank(score),
+            self.leaderboard.percentile(score),
+            self.leaderboard.count()
+        )
+    
+    def draw_playing_dirty(self, alpha=1.0):
+        """Рисуем игру, перерисовывая только изменившиеся области"""
+        profiler = self.profiler
+        with profiler.section("road"):
+            if self.full_redraw:
+                self.road.draw(self.screen, alpha)
+                dirty = None
+            else:
+                # Стираем то, что рисовали на прошлом кадре
+                dirty = self.prev_dirty
+                for rect in dirty:
+                    self.road.draw_area(self.screen, rect, alpha)
+            
+            # Разметка движется каждый кадр
+            current = self.road.get_moving_rects()
+            if dirty is not None:
+                for rect in current:
+                    self.road.draw_area(self.screen, rect, alpha)
+        
+        with profiler.section("obstacle_draw"):
+            current += self.obstacles.draw(self.screen, alpha, return_rects=True)
+        with profiler.section("car_draw"):
+            current.append(self.car.draw(self.screen, alpha))
+        with profiler.section("effects"):
+            particles_rect = self.particles.draw(self.screen)
+            if particles_rect:
+                current.append(particles_rect)
+        with profiler.section("hud"):
+            current += self.draw_hud()
+        
+        screen_rect = self.screen.get_rect()
+        current = [rect.clip(screen_rect) for rect in current]
+        self.prev_dirty = current
+        
+        if dirty is None:
+            self.full_redraw = False
+            return None
+        
+        rects = dirty + current
+        area = sum(rect.width * rect.height for rect in rects)
+        if area > self.dirty_threshold * self.width * self.height:
+            return None
+        return rects
+    
+    def present(self, rects):
+        """Выводим кадр на экран: целиком или только изменившиеся области"""
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+    
+    def update(self, controls=None):
+        """Один шаг симуляции в зависимости от состояния
         
-        # Скорость
-        speed_text = f"СКОРОСТЬ: {int(self.car.get_speed())*10} км/ч"
-        speed_surface = self.font_small.render(speed_text, True, (200, 200, 200))
-        self.screen.blit(speed_surface, (10, 80))
+        controls - (влево, вправо, газ, тормоз); None - спросить у контроллера.
+        """
+        if self.state == GameState.PLAYING:
+            if self.replay_player:
+                # Управление из записи, а не с клавиатуры
+                controls = self.replay_player.get_controls(self)
+            else:
+                if controls is None:
+                    with self.profiler.section("input"):
+                        controls = self.controller.get_controls(self)
+                if self.recorder:
+                    self.recorder.record(controls)
+            
+            self.update_playing(*controls)
+            
+            # Заезд закончился - сохраняем запись
+            if self.state == GameState.CRASH and self.recorder and not self.replay_player:
+                self.recorder.save()
+        elif self.state == GameState.CRASH:
+            self.update_crash()
+    
+    def draw(self, alpha=1.0):
+        """Рисуем текущее состояние игры
+        
+        alpha - доля времени между прошлым и текущим шагом симуляции,
+        позиции машин и разметки плавно интерполируются.
+        Возвращает список изменившихся областей или None, если
+        экран надо обновить целиком.
+        """
+        if self.state == GameState.PLAYING:
+            # Ночью затемнение меняет весь экран - частичное обновление не поможет
+            if self.dirty_rects and not self.night:
+                return self.draw_playing_dirty(alpha)
+            self.full_redraw = True
+            self.prev_dirty = []
+            profiler = self.profiler
+            with profiler.section("road"):
+                self.road.draw(self.screen, alpha)
+            with profiler.section("obstacle_draw"):
+                self.obstacles.draw(self.screen, alpha)
+            with profiler.section("lighting"):
+                self.draw_night(alpha)
+            with profiler.section("car_draw"):
+                self.car.draw(self.screen, alpha)
+            with profiler.section("effects"):
+                self.particles.draw(self.screen)
+            with profiler.section("hud"):
+                self.draw_hud()
+            return None
+        
+        # Экраны меню и т.п. рисуются целиком, после них - полная перерисовка
+        self.full_redraw = True
+        self.prev_dirty = []
+        
+        if self.state == GameState.CRASH:
+            # Во время анимации симуляция стоит - рисуем последний шаг без интерполяции
+            self.draw_crash_animation()
+        
+        elif self.state == GameState.MENU:
+            self.draw_menu()
+        
+        elif self.state == GameState.LOADING:
+            self.draw_loading()
+        
+        elif self.state == GameState.GAME_OVER:
+            self.draw_game_over()
+    
+    def simulate(self, policy=None, max_frames=60 * 60 * 5, seed=None):
+        """Прогон одной игры без окна и без ограничения FPS
+        
+        policy(game) возвращает (влево, вправо, газ, тормоз) на каждый шаг.
+        Возвращает словарь с результатом заезда.
+        """
+        self.reset_game(seed)
+        frames = 0
+        while self.state == GameState.PLAYING and frames < max_frames:
+            controls = policy(self) if policy else ()
+            self.update_playing(*controls)
+            frames += 1
+        
+        return {
+            'score': self.score_manager.get_current_score(),
+            'frames': frames,
+            'crashed': self.state == GameState.CRASH,
+            'cause': self.crash_cause,
+            'seed': self.run_seed,
+        }
     
     def run(self):
-        """Главный игровой цикл"""
+        """Главный игровой цикл (фиксированный шаг симуляции)"""
         running = True
+        step = 1.0 / self.tick_rate
+        accumulator = 0.0
+        previous = time.perf_counter()
+        
+        profiler = self.profiler
+        
+        # Всё, что создано при запуске, живёт до конца игры: убираем эти
+        # объекты из проверок сборщика мусора, чтобы его проходы были короче
+        # (если игра ещё не загружена - после загрузки, см. update_loading)
+        first_frame = True
+        if self.loaded:
+            gc.collect()
+            gc.freeze()
         
         while running:
-            # Обработка событий
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                
-                if event.type == pygame.KEYDOWN:
-                    # Меню - начать игру
-                    if self.state == GameState.MENU:
-                        if event.key in [pygame.K_RETURN, pygame.K_SPACE]:
-                            self.reset_game()
-                    
-                    # Game Over - начать заново или выйти в меню
-                    elif self.state == GameState.GAME_OVER:
-                        if event.key in [pygame.K_RETURN, pygame.K_SPACE]:
-                            self.reset_game()
-                        elif event.key == pygame.K_ESCAPE:
-                            self.state = GameState.MENU
-                    
-                    # Во время игры
-                    elif self.state == GameState.PLAYING:
-                        if event.key == pygame.K_SPACE:
-                            self.car.beep()
-                        if event.key == pygame.K_e:
-                            self.car.toggle_headlights()
+            profiler.begin_frame()
             
-            # Логика игры в зависимости от состояния
-            if self.state == GameState.PLAYING:
-                # Управление
-                keys = pygame.key.get_pressed()
-                if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                    self.car.move_left()
-                if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                    self.car.move_right()
-                if keys[pygame.K_UP] or keys[pygame.K_w]:
-                    self.car.accelerate()
-                if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-                    self.car.brake()
-                
-                # Обновление
-                self.car.update_speed()
-                self.road.update(self.car.get_speed())
-                self.car.keep_on_road(
-                    self.road.get_left_edge(),
-                    self.road.get_right_edge()
-                )
-                
-                # Генерация препятствий
-                self.obstacle_spawn_timer += 1
-                if self.obstacle_spawn_timer >= self.obstacle_spawn_delay:
-                    self.spawn_obstacle()
-                    self.obstacle_spawn_timer = 0
-                    # Уменьшаем задержку с ростом очков (усложняем игру)
-                    min_delay = 60
-                    self.obstacle_spawn_delay = max(
-                        min_delay,
-                        120 - self.score_manager.get_current_score() * 2
-                    )
-                
-                self.update_obstacles()
-                
-                # Проверка столкновений
-                if self.check_collisions():
-                    self.state = GameState.CRASH
-                    self.crash_timer = 0
-                    self.crash_flash = 0
-                
-                # Рисование
-                self.road.draw(self.screen)
-                for obstacle in self.obstacles:
-                    obstacle.draw(self.screen)
-                self.car.draw(self.screen)
-                self.draw_hud()
+            # Сколько реального времени прошло с прошлого кадра
+            now = time.perf_counter()
+            # Ограничиваем, чтобы после долгого зависания не догонять бесконечно
+            accumulator += min(now - previous, 0.25)
+            previous = now
             
-            elif self.state == GameState.CRASH:
-                # Анимация столкновения
-                self.draw_crash_animation()
-                self.crash_timer += 1
-                self.crash_flash += 1
-                
-                if self.crash_timer >= self.crash_duration:
-                    # Сохраняем рекорд
-                    self.score_manager.save_high_score()
-                    self.state = GameState.GAME_OVER
+            # Обработка событий
+            with profiler.section("events"):
+                for event in pygame.event.get():
+                    if not self.handle_event(event):
+                        running = False
             
-            elif self.state == GameState.MENU:
-                self.draw_menu()
+            # Фоновая загрузка: переносим готовые картинки в кэш
+            if not self.loaded:
+                with profiler.section("loading"):
+                    self.update_loading()
             
-            elif self.state == GameState.GAME_OVER:
-                self.draw_game_over()
+            # Логика игры: столько шагов, сколько накопилось времени
+            # (управление спрашиваем у контроллера на каждом шаге)
+            while accumulator >= step:
+                self.update()
+                accumulator -= step
+            
+            # Рисование с интерполяцией между шагами
+            rects = self.draw(accumulator / step)
+            with profiler.section("overlay"):
+                overlay_rect = profiler.draw_overlay(self.screen, self.font_small)
+            if overlay_rect:
+                # Таблицу на следующем кадре стираем вместе с остальным
+                self.prev_dirty.append(overlay_rect)
+                if rects is not None:
+                    rects.append(overlay_rect)
             
             # Обновление экрана
-            pygame.display.flip()
-            self.clock.tick(60)
+            with profiler.section("flip"):
+                self.present(rects)
+            
+            if first_frame:
+                self.startup.mark("first_frame")
+                first_frame = False
+            # Меню на экране и всё загружено - отчёт о запуске
+            if self.print_startup and self.loaded:
+                print(self.startup.report())
+                self.print_startup = False
+            with profiler.section("sleep"):
+                self.clock.tick(self.max_fps)
+            
+            profiler.end_frame()
         
+        # Сохраняем покадровые замеры и запись заезда (если просили)
+        profiler.dump()
+        if self.recorder and not self.replay_player:
+            self.recorder.save()
+        # Дожидаемся фоновой записи рекорда и таблицы лидеров
+        self.score_manager.close()
+        if self.leaderboard:
+            self.leaderboard.close()
         pygame.quit()
-        sys.exit()
\ No newline at end of file
+        sys.exit()
@@ -5,4 +5,5 @@ class GameState(Enum):
     MENU = 1      # Главное меню
     PLAYING = 2   # Игра идёт
     GAME_OVER = 3 # Игра окончена
-    CRASH = 4     # Анимация столкновения
\ No newline at end of file
+    CRASH = 4     # Анимация столкновения
+    LOADING = 5   # Ждём окончания загрузки картинок и звуков
\ No newline at end of file
@@ -0,0 +1,189 @@
+import bisect
+import queue
+import sqlite3
+import threading
+import time
+
+
+class RunRecord:
+    """Один завершённый заезд"""
+
+    __slots__ = ('player', 'score', 'duration', 'max_speed', 'seed', 'created_at')
+
+    def __init__(self, player, score, duration, max_speed, seed, created_at=None):
+        self.player = player
+        self.score = score
+        self.duration = duration    # Секунды
+        self.max_speed = max_speed
+        self.seed = seed
+        self.created_at = created_at if created_at is not None else time.time()
+
+    def as_row(self):
+        return (self.player, self.score, self.duration, self.max_speed, self.seed, self.created_at)
+
+
+class Leaderboard:
+    """Таблица лидеров: все заезды в SQLite, запросы - из памяти
+
+    База живёт в отдельном потоке: загрузка при старте и запись новых
+    заездов не тормозят игру. Для запросов держим в памяти отсортированный
+    список очков (место и процентиль - бинарный поиск), лучшие заезды и
+    лучший результат каждого игрока.
+    """
+
+    def __init__(self, db_file="leaderboard.db", top_size=100):
+        self.db_file = db_file
+        self.top_size = top_size
+
+        self._lock = threading.Lock()
+        self._scores = []        # Очки всех заездов по возрастанию
+        self._top = []           # Лучшие заезды: (-очки, порядковый номер, RunRecord)
+        self._best = {}          # игрок -> лучший RunRecord
+        self._counter = 0
+        self.loaded = False
+
+        # Фоновый поток с базой данных
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name='Leaderboard', daemon=True)
+        self._thread.start()
+
+    # ===== Фоновый поток =====
+
+    def _worker(self):
+        """Открываем базу, загружаем индекс и пишем новые заезды"""
+        try:
+            connection = sqlite3.connect(self.db_file)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "id INTEGER PRIMARY KEY, player TEXT NOT NULL, score INTEGER NOT NULL, "
+                "duration REAL, max_speed REAL, seed INTEGER, created_at REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS runs_score ON runs (score DESC)")
+            connection.execute("CREATE INDEX IF NOT EXISTS runs_player ON runs (player, score DESC)")
+            connection.commit()
+            self._load(connection)
+        except Exception as e:
+            print(f"Ошибка открытия таблицы лидеров: {e}")
+            connection = None
+            self._finish_loading([], [], {})
+
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            # Записываем всё, что накопилось, одной транзакцией
+            records = [record]
+            while True:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    self._queue.put(None)
+                    break
+                records.append(record)
+            if connection is None:
+                continue
+            try:
+                connection.executemany(
+                    "INSERT INTO runs (player, score, duration, max_speed, seed, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [r.as_row() for r in records]
+                )
+                connection.commit()
+            except Exception as e:
+                print(f"Ошибка записи в таблицу лидеров: {e}")
+
+        if connection is not None:
+            connection.close()
+
+    def _load(self, connection):
+        """Строим индекс в памяти из базы"""
+        scores = [row[0] for row in connection.execute("SELECT score FROM runs ORDER BY score")]
+        top = [RunRecord(*row) for row in connection.execute(
+            "SELECT player, score, duration, max_speed, seed, created_at "
+            "FROM runs ORDER BY score DESC, id LIMIT ?", (self.top_size,))]
+        best = {}
+        # В SQLite остальные столбцы при MAX() берутся из строки с максимумом
+        for row in connection.execute(
+                "SELECT player, MAX(score), duration, max_speed, seed, created_at "
+                "FROM runs GROUP BY player"):
+            best[row[0]] = RunRecord(*row)
+        self._finish_loading(scores, top, best)
+
+    def _finish_loading(self, scores, top, best):
+        """Подменяем индекс загруженным (и добавляем заезды, записанные во время загрузки)"""
+        with self._lock:
+            pending_scores = self._scores
+            pending_top = [entry[2] for entry in self._top]
+            pending_best = self._best
+
+            self._scores = scores
+            self._top = []
+            self._best = best
+            for record in top:
+                self._add_top(record)
+            for score in pending_scores:
+                bisect.insort(self._scores, score)
+            for record in pending_top:
+                self._add_top(record)
+            for record in pending_best.values():
+                self._add_best(record)
+            self.loaded = True
+
+    # ===== Индекс в памяти =====
+
+    def _add_top(self, record):
+        self._counter += 1
+        bisect.insort(self._top, (-record.score, self._counter, record))
+        if len(self._top) > self.top_size:
+            self._top.pop()
+
+    def _add_best(self, record):
+        best = self._best.get(record.player)
+        if best is None or record.score > best.score:
+            self._best[record.player] = record
+
+    # ===== Для игры =====
+
+    def record_run(self, player, score, duration, max_speed, seed):
+        """Добавляем заезд: индекс обновляется сразу, запись в базу - в фоне"""
+        record = RunRecord(player, score, duration, max_speed, seed)
+        with self._lock:
+            bisect.insort(self._scores, score)
+            self._add_top(record)
+            self._add_best(record)
+        self._queue.put(record)
+        return record
+
+    def top(self, n=10):
+        """n лучших заездов"""
+        with self._lock:
+            return [entry[2] for entry in self._top[:n]]
+
+    def player_best(self, player):
+        """Лучший заезд игрока (или None)"""
+        with self._lock:
+            return self._best.get(player)
+
+    def rank(self, score):
+        """Место результата среди всех заездов (1 - лучший)"""
+        with self._lock:
+            return len(self._scores) - bisect.bisect_right(self._scores, score) + 1
+
+    def percentile(self, score):
+        """Какой процент заездов хуже этого результата"""
+        with self._lock:
+            if not self._scores:
+                return 100.0
+            return 100.0 * bisect.bisect_left(self._scores, score) / len(self._scores)
+
+    def count(self):
+        """Сколько всего заездов"""
+        with self._lock:
+            return len(self._scores)
+
+    def close(self, timeout=5.0):
+        """Дописываем очередь в базу и закрываем её"""
+        self._queue.put(None)
+        self._thread.join(timeout)
@@ -0,0 +1,107 @@
+import pygame
+import numpy as np
+
+# Конусы света фар относительно центра машины
+CONE_LEFT = ((-10, -25), (-60, -200), (10, -200))
+CONE_RIGHT = ((10, -25), (-10, -200), (60, -200))
+CONE_OFFSET = (-60, -200)  # Левый верхний угол картинки конусов относительно машины
+CONE_SIZE = (121, 176)
+
+
+class Lighting:
+    """Свет фар и ночной режим
+
+    Конусы фар рисуются один раз в картинку с прозрачностью (яркие у машины,
+    тусклые вдали) и дальше только копируются на экран. Ночью сцену
+    затемняет готовая картинка темноты с вырезанными конусами: она вдвое
+    больше экрана, и на экран копируется окно вокруг машины - одна
+    операция за кадр, без рисования многоугольников.
+    """
+
+    def __init__(self, color=(255, 255, 150), alpha=60, darkness=210, gradient=True):
+        self.color = color
+        self.alpha = alpha          # Прозрачность конусов днём (у машины)
+        self.darkness = darkness    # Насколько темно ночью (0-255)
+        self.gradient = gradient    # Свет слабеет с расстоянием
+        self._mask = None
+        self._cones = None
+        self._night = {}            # размер экрана -> (темнота с конусами, просто темнота)
+
+    def _cone_mask(self):
+        """Яркость света в каждой точке картинки конусов (0..1), массив (ширина, высота)"""
+        if self._mask is None:
+            shape = pygame.Surface(CONE_SIZE, pygame.SRCALPHA)
+            for cone in (CONE_LEFT, CONE_RIGHT):
+                points = [(px - CONE_OFFSET[0], py - CONE_OFFSET[1]) for px, py in cone]
+                pygame.draw.polygon(shape, (255, 255, 255, 255), points)
+            mask = pygame.surfarray.array_alpha(shape) / 255.0
+            if self.gradient:
+                # Сверху (вдали от машины) - четверть яркости, у машины - полная
+                falloff = np.linspace(0.25, 1.0, CONE_SIZE[1])
+                mask *= falloff[np.newaxis, :]
+            self._mask = mask
+        return self._mask
+
+    @staticmethod
+    def _convert(surface):
+        """Ускоряем копирование на экран, если окно уже создано"""
+        if pygame.display.get_surface() is not None:
+            return surface.convert_alpha()
+        return surface
+
+    def get_cones(self):
+        """Картинка конусов фар (рисуется один раз)"""
+        if self._cones is None:
+            cones = pygame.Surface(CONE_SIZE, pygame.SRCALPHA)
+            cones.fill((*self.color, 0))
+            alpha = pygame.surfarray.pixels_alpha(cones)
+            alpha[:] = (self._cone_mask() * self.alpha).astype(np.uint8)
+            del alpha  # Отпускаем блокировку картинки
+            self._cones = self._convert(cones)
+        return self._cones
+
+    def draw_headlights(self, screen, x, y):
+        """Рисуем свет фар машины с центром (x, y), возвращаем закрашенную область"""
+        return screen.blit(self.get_cones(), (x + CONE_OFFSET[0], y + CONE_OFFSET[1]))
+
+    def _get_night(self, size):
+        """Картинки темноты для экрана размера size (строятся один раз)"""
+        night = self._night.get(size)
+        if night is None:
+            width, height = size
+            dark = pygame.Surface(size, pygame.SRCALPHA)
+            dark.fill((0, 0, 0, self.darkness))
+
+            # Вдвое больше экрана, конусы - так, чтобы машина была в точке (width, height)
+            lit = pygame.Surface((width * 2, height * 2), pygame.SRCALPHA)
+            lit.fill((0, 0, 0, self.darkness))
+            left = width + CONE_OFFSET[0]
+            top = height + CONE_OFFSET[1]
+            alpha = pygame.surfarray.pixels_alpha(lit)
+            alpha[left:left + CONE_SIZE[0], top:top + CONE_SIZE[1]] = (
+                self.darkness * (1.0 - self._cone_mask())).astype(np.uint8)
+            del alpha
+
+            night = (self._convert(lit), self._convert(dark))
+            self._night[size] = night
+        return night
+
+    def draw_night(self, screen, x, y, headlights_on=True):
+        """Затемняем весь экран, оставляя освещённым свет фар машины в (x, y)"""
+        width, height = screen.get_size()
+        lit, dark = self._get_night((width, height))
+        if not headlights_on:
+            return screen.blit(dark, (0, 0))
+        # Окно большой картинки, в котором машина оказывается в точке (x, y)
+        x = min(max(int(x), 0), width)
+        y = min(max(int(y), 0), height)
+        return screen.blit(lit, (0, 0), (width - x, height - y, width, height))
+
+    def clear(self):
+        """Забываем готовые картинки (например, после смены окна)"""
+        self._cones = None
+        self._night.clear()
+
+
+# Один набор картинок света на весь процесс
+lighting = Lighting()
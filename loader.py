@@ -0,0 +1,137 @@
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+from assets import assets, list_images, read_atlas_index, atlas_image_path, ATLAS_INDEX
+from audio import audio
+
+
+def _decode_image(path, size):
+    """Читаем и масштабируем картинку (в потоке пула)"""
+    image = pygame.image.load(path)
+    if size is not None:
+        image = pygame.transform.scale(image, size)
+    return image
+
+
+def _decode_sound(path):
+    """Читаем звук (в потоке пула; без микшера - None)"""
+    if not audio.enabled:
+        return None
+    return pygame.mixer.Sound(path)
+
+
+class AssetLoader:
+    """Фоновая загрузка картинок и звуков
+
+    Потоки пула читают и распаковывают файлы, а перевод картинок в формат
+    экрана (convert_alpha) и запись в общие кэши делаются в главном потоке
+    порциями: step(бюджет) работает не дольше заданного времени, поэтому
+    меню не замирает даже при большом наборе спрайтов.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self._executor = None
+        self._ready = queue.Queue()  # Прочитанные файлы: (вид, путь, размер или индекс атласа, результат, ошибка)
+        self._folders = []           # (папка, размер, пути) - список собираем в конце
+        self.total = 0               # Сколько файлов поставлено в загрузку
+        self.finished = 0            # Сколько уже лежит в кэше
+        self.errors = 0
+
+    def _submit(self, kind, path, info, func, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='AssetLoader')
+        self.total += 1
+        self._executor.submit(self._run, kind, path, info, func, args)
+
+    def _run(self, kind, path, info, func, args):
+        """Работа потока пула: ошибку передаём в главный поток вместе с результатом"""
+        try:
+            self._ready.put((kind, path, info, func(*args), None))
+        except Exception as e:
+            self._ready.put((kind, path, info, None, e))
+
+    def add_image(self, path, size=None):
+        """Загрузить картинку (если её ещё нет в кэше)"""
+        if not assets.has_image(path, size):
+            self._submit('image', path, size, _decode_image, path, size)
+
+    def add_folder(self, folder, size=None):
+        """Загрузить все картинки папки"""
+        paths = list_images(folder)
+        self._folders.append((folder, size, paths))
+        for path in paths:
+            self.add_image(path, size)
+
+    def add_atlas(self, index_path=ATLAS_INDEX):
+        """Загрузить атлас спрайтов; False - атласа нет (загружайте отдельные файлы)"""
+        index = read_atlas_index(index_path)
+        if index is None:
+            return False
+        path = atlas_image_path(index_path, index)
+        self._submit('atlas', path, index, _decode_image, path, None)
+        return True
+
+    def add_sound(self, path):
+        """Загрузить звук"""
+        self._submit('sound', path, None, _decode_sound, path)
+
+    def _store(self, kind, path, info, result, error):
+        """Кладём прочитанный файл в кэш (главный поток)"""
+        if kind == 'sound':
+            audio.put(path, result)
+        elif error is not None:
+            self.errors += 1
+            print(f"Ошибка загрузки изображения: {error}")
+        elif kind == 'atlas':
+            assets.put_atlas(info, result)
+        else:
+            assets.put_image(path, info, result)
+
+    def step(self, budget_ms=None):
+        """Переносим готовые файлы в кэш не дольше budget_ms (None - ждём всё)
+
+        Возвращает долю загруженного (0..1).
+        """
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        while self.finished < self.total:
+            try:
+                if deadline is None:
+                    item = self._ready.get()
+                else:
+                    item = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            self._store(*item)
+            self.finished += 1
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        if self.done() and (self._executor is not None or self._folders):
+            self._finish()
+        return self.progress()
+
+    def _finish(self):
+        """Всё загружено: собираем списки картинок папок и останавливаем пул"""
+        for folder, size, paths in self._folders:
+            images = [assets.get_image(path, size) for path in paths
+                      if assets.has_image(path, size)]
+            assets.put_folder_images(folder, size, images)
+        self._folders = []
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def finish(self):
+        """Дожидаемся окончания загрузки"""
+        return self.step(None)
+
+    def done(self):
+        return self.finished == self.total
+
+    def progress(self):
+        """Доля загруженного (0..1)"""
+        return self.finished / self.total if self.total else 1.0
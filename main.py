@@ -1,9 +1,65 @@
+import time
+START_TIME = time.perf_counter()  # Отсчёт времени запуска - до импорта pygame
+
+import argparse
 from game import Game 
+from replay import Replay, play_headless
+from profiler import StartupTimer
+from controllers import PolicyController, POLICIES
 
 
 def main():
-    game = Game()
+    parser = argparse.ArgumentParser(description="🏁 ГОНКИ")
+    parser.add_argument("--seed", type=int, help="зерно случайности (одинаковые заезды)")
+    parser.add_argument("--player", default="ИГРОК", help="имя игрока в таблице лидеров")
+    parser.add_argument("--record", metavar="FILE", help="записать заезд в файл")
+    parser.add_argument("--night", action="store_true", help="ночной режим (N - переключить в игре)")
+    parser.add_argument("--lanes", type=int, metavar="N", help="машины едут по N полосам")
+    parser.add_argument("--tick-rate", type=int, default=60, metavar="N",
+                        help="шагов логики в секунду (по умолчанию 60; запись хранит свой)")
+    parser.add_argument("--max-fps", type=int, metavar="N",
+                        help="рисовать не чаще N кадров в секунду (по умолчанию 60; "
+                             "0 - без ограничения)")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="перерисовывать только изменившиеся области (для слабых компьютеров)")
+    parser.add_argument("--dirty-threshold", type=float, default=0.5, metavar="ДОЛЯ",
+                        help="с --dirty-rects: если изменилось больше этой доли экрана - кадр целиком")
+    parser.add_argument("--profile", action="store_true",
+                        help="замерять время фаз кадра (F3 - таблица на экране)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="при выходе записать замеры каждого кадра в FILE (.csv или .json)")
+    parser.add_argument("--bot", choices=sorted(POLICIES), help="вместо игрока управляет бот")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="вывести время этапов запуска")
+    parser.add_argument("--replay", metavar="FILE", help="воспроизвести записанный заезд")
+    parser.add_argument("--headless", action="store_true",
+                        help="с --replay: пересчитать заезд без окна и вывести результат")
+    args = parser.parse_args()
+    
+    startup = None
+    if args.startup_report:
+        startup = StartupTimer(START_TIME)
+        startup.mark("imports")
+    
+    # Настройки отображения - одинаковые для игры и просмотра записи
+    display = dict(max_fps=args.max_fps, night=args.night, dirty_rects=args.dirty_rects,
+                   dirty_threshold=args.dirty_threshold, profile=args.profile,
+                   trace_file=args.trace, startup=startup)
+    
+    if args.replay:
+        replay = Replay.load(args.replay)
+        if args.headless:
+            print(play_headless(replay))
+            return
+        game = Game(tick_rate=replay.tick_rate, lanes=replay.lanes or None, **display)
+        game.start_replay(replay)
+        game.run()
+        return
+    
+    controller = PolicyController(POLICIES[args.bot](args.seed)) if args.bot else None
+    game = Game(seed=args.seed, record_file=args.record, player_name=args.player,
+                controller=controller, lanes=args.lanes, tick_rate=args.tick_rate, **display)
     game.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,91 +1,55 @@
 import pygame
 import random
-import os
+from assets import assets
 
 class ObstacleCar:
     """Встречная машина-препятствие"""
     
-    def __init__(self, x, y, speed=5):
+    # Фиксированный набор полей - меньше памяти на каждую машину
+    __slots__ = ('x', 'y', 'prev_y', 'speed', 'width', 'height',
+                 'image', 'sprite_index', 'passed')
+    
+    def __init__(self, x, y, speed=5, rng=random):
+        self.width = 40
+        self.height = 80
+        self.reset(x, y, speed, rng)
+    
+    def reset(self, x, y, speed=5, rng=random):
+        """Заново настраиваем машину (для повторного использования из пула)"""
         self.x = x
         self.y = y
+        self.prev_y = y  # Позиция на прошлом шаге симуляции
         self.speed = speed
-        self.width = 40
-        self.height = 80
-        self.image = None
         self.passed = False  # Флаг для подсчёта очков
         
-        # Загружаем случайное изображение из папки imgs/obstacles/
-        self._load_random_image()
-    
-    def _load_random_image(self):
-        """Загружаем случайное изображение машины"""
-        try:
-            # Путь к папке с изображениями встречных машин
-            obstacles_folder = "imgs/obstacles/"
-            
-            # Проверяем существование папки
-            if os.path.exists(obstacles_folder):
-                # Получаем список всех файлов изображений
-                image_files = [f for f in os.listdir(obstacles_folder) 
-                             if f.endswith(('.png', '.jpg', '.jpeg', '.PNG', '.JPG', '.JPEG'))]
-                
-                if image_files:
-                    # Выбираем случайный файл
-                    random_image = random.choice(image_files)
-                    image_path = os.path.join(obstacles_folder, random_image)
-                    
-                    # Загружаем и масштабируем
-                    self.image = pygame.image.load(image_path)
-                    self.image = pygame.transform.scale(self.image, (self.width, self.height))
-                    return
-            
-            # Если не получилось загрузить - создаём простую машинку
-            self._create_simple_car()
-        except Exception as e:
-            # При любой ошибке - создаём простую машинку
-            print(f"Ошибка загрузки изображения: {e}")
-            self._create_simple_car()
-    
-    def _create_simple_car(self):
-        """Создаём простое изображение машины"""
-        # Случайный цвет
-        colors = [
-            (0, 0, 255),    # Синий
-            (255, 165, 0),  # Оранжевый
-            (128, 0, 128),  # Фиолетовый
-            (0, 255, 255),  # Голубой
-            (255, 192, 203) # Розовый
-        ]
-        color = random.choice(colors)
-        
-        # Создаём поверхность
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        
-        # Рисуем машинку
-        # Кузов
-        pygame.draw.rect(self.image, color, (10, 20, 40, 50))
-        # Крыша
-        dark = tuple(c // 2 for c in color)
-        pygame.draw.rect(self.image, dark, (15, 10, 30, 25))
-        # Колёса
-        pygame.draw.circle(self.image, (0, 0, 0), (18, 25), 6)
-        pygame.draw.circle(self.image, (0, 0, 0), (42, 25), 6)
-        pygame.draw.circle(self.image, (0, 0, 0), (18, 65), 6)
-        pygame.draw.circle(self.image, (0, 0, 0), (42, 65), 6)
-    
-    def update(self):
-        """Обновляем позицию - движемся вниз"""
-        self.y += self.speed
-    
-    def draw(self, screen):
-        """Рисуем машину"""
+        # Случайное изображение из папки imgs/obstacles/ (через общий кэш)
+        self._load_random_image(rng)
+    
+    def _load_random_image(self, rng=random):
+        """Берём случайный спрайт машины из общего кэша (без чтения с диска)"""
+        sprites = assets.get_obstacle_sprites()
+        self.sprite_index = rng.randrange(len(sprites))
+        self.image = sprites[self.sprite_index]
+    
+    def update(self, dt=1.0):
+        """Обновляем позицию - движемся вниз (dt - длина шага в кадрах при 60 FPS)"""
+        self.prev_y = self.y
+        self.y += self.speed * dt
+    
+    def draw(self, screen, alpha=1.0):
+        """Рисуем машину (alpha - доля между прошлым и текущим шагом)"""
         if self.image:
-            screen.blit(self.image, (self.x - self.width // 2, self.y - self.height // 2))
+            y = self.prev_y + (self.y - self.prev_y) * alpha
+            screen.blit(self.image, (self.x - self.width // 2, y - self.height // 2))
     
     def is_off_screen(self, screen_height):
         """Проверяем, вышла ли машина за экран"""
         return self.y > screen_height + 50
     
+    def get_mask(self):
+        """Маска спрайта для точной проверки столкновений (общая, из кэша)"""
+        return assets.get_mask(self.image)
+    
     def get_rect(self):
         """Получаем прямоугольник для проверки столкновений"""
         return pygame.Rect(
@@ -95,6 +59,42 @@ class ObstacleCar:
             self.height
         )
 
+
+class ObstaclePool:
+    """Пул встречных машин: ушедшие за экран машины используются повторно"""
+    
+    def __init__(self):
+        self.free = []      # Свободные машины
+        self.in_use = 0     # Машин сейчас на дороге
+        self.created = 0    # Сколько машин создано всего
+        self.reused = 0     # Сколько раз машину взяли из пула
+    
+    def acquire(self, x, y, speed=5, rng=random):
+        """Берём машину из пула (или создаём, если свободных нет)"""
+        if self.free:
+            obstacle = self.free.pop()
+            obstacle.reset(x, y, speed, rng)
+            self.reused += 1
+        else:
+            obstacle = ObstacleCar(x, y, speed, rng)
+            self.created += 1
+        self.in_use += 1
+        return obstacle
+    
+    def release(self, obstacle):
+        """Возвращаем машину в пул"""
+        self.free.append(obstacle)
+        self.in_use -= 1
+    
+    def get_stats(self):
+        """Заполненность пула"""
+        return {
+            'in_use': self.in_use,
+            'free': len(self.free),
+            'created': self.created,
+            'reused': self.reused,
+        }
+
 # ===== ДЕМО-РЕЖИМ =====
 if __name__ == "__main__":
     """Демонстрация класса ObstacleCar - встречные машины!"""
@@ -113,7 +113,8 @@ if __name__ == "__main__":
     grass_color = (0, 180, 0)
     road_color = (60, 60, 60)
     
-    # Создаём несколько машин для демонстрации
+    # Создаём несколько машин для демонстрации (машины берём из пула)
+    pool = ObstaclePool()
     obstacles = []
     spawn_timer = 0
     
@@ -126,14 +127,14 @@ if __name__ == "__main__":
                 if event.key == pygame.K_SPACE:
                     # Создаём новую машину по нажатию пробела
                     x = random.randint(250, 550)
-                    obstacle = ObstacleCar(x, -50, speed=random.randint(3, 8))
+                    obstacle = pool.acquire(x, -50, speed=random.randint(3, 8))
                     obstacles.append(obstacle)
         
         # Автоматическая генерация машин
         spawn_timer += 1
         if spawn_timer > 90:
             x = random.randint(250, 550)
-            obstacle = ObstacleCar(x, -50, speed=random.randint(3, 8))
+            obstacle = pool.acquire(x, -50, speed=random.randint(3, 8))
             obstacles.append(obstacle)
             spawn_timer = 0
         
@@ -142,6 +143,7 @@ if __name__ == "__main__":
             obstacle.update()
             if obstacle.is_off_screen(600):
                 obstacles.remove(obstacle)
+                pool.release(obstacle)
         
         # Рисование
         screen.fill(grass_color)
@@ -169,6 +171,7 @@ if __name__ == "__main__":
         params = [
             f"Количество машин: {len(obstacles)}",
             f"Таймер создания: {90 - spawn_timer}",
+            f"Пул: создано {pool.created}, повторно {pool.reused}, свободно {len(pool.free)}",
         ]
         
         y_offset = 60
@@ -0,0 +1,127 @@
+import random
+import numpy as np
+from assets import assets, OBSTACLE_SIZE
+
+
+class ObstacleStore:
+    """Все встречные машины в массивах NumPy (одна строка - одна машина)
+
+    Вместо списка объектов ObstacleCar храним столбцы x, y, speed, passed
+    и номер спрайта. Движение, удаление ушедших за экран машин, начисление
+    очков и построение прямоугольников делаются одной операцией на весь массив.
+    """
+
+    def __init__(self, capacity=64):
+        self.width, self.height = OBSTACLE_SIZE
+        self.count = 0
+        self.capacity = capacity
+
+        # Столбцы
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.prev_y = np.zeros(capacity, dtype=np.float64)  # Для интерполяции
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.passed = np.zeros(capacity, dtype=bool)         # Флаг для подсчёта очков
+        self.sprite = np.zeros(capacity, dtype=np.int32)     # Номер спрайта в кэше
+        self.lane = np.zeros(capacity, dtype=np.int32)       # Полоса (-1 - без полос)
+
+        self.grow_count = 0  # Сколько раз пришлось увеличивать массивы
+
+        # Общие спрайты из кэша картинок
+        self.sprites = assets.get_obstacle_sprites()
+        # Их маски для точных столкновений (по одной на спрайт, а не на машину)
+        self.masks = [assets.get_mask(sprite) for sprite in self.sprites]
+
+    def _columns(self):
+        """Все столбцы хранилища"""
+        return [self.x, self.y, self.prev_y, self.speed, self.passed, self.sprite, self.lane]
+
+    def _grow(self):
+        """Увеличиваем вместимость в два раза"""
+        self.capacity *= 2
+        self.grow_count += 1
+        self.x, self.y, self.prev_y, self.speed, self.passed, self.sprite, self.lane = [
+            np.resize(column, self.capacity) for column in self._columns()
+        ]
+
+    def get_stats(self):
+        """Заполненность хранилища (строки переиспользуются, новых объектов нет)"""
+        return {
+            'count': self.count,
+            'capacity': self.capacity,
+            'occupancy': self.count / self.capacity,
+            'grow_count': self.grow_count,
+        }
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, speed, sprite=None, rng=random, lane=-1):
+        """Добавляем новую машину, возвращаем номер её строки"""
+        if self.count == self.capacity:
+            self._grow()
+        if sprite is None:
+            sprite = rng.randrange(len(self.sprites))
+
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.prev_y[i] = y
+        self.speed[i] = speed
+        self.passed[i] = False
+        self.lane[i] = lane
+        self.sprite[i] = sprite
+        self.count += 1
+        return i
+
+    def clear(self):
+        """Убираем все машины"""
+        self.count = 0
+
+    def update(self, screen_height, dt=1.0):
+        """Двигаем все машины вниз и убираем ушедшие за экран
+
+        Возвращает, сколько машин мы обошли (очки за этот шаг).
+        """
+        n = self.count
+        if n == 0:
+            return 0
+
+        y = self.y[:n]
+        self.prev_y[:n] = y
+        y += self.speed[:n] * dt
+
+        # Машины, вышедшие за экран
+        off_screen = y > screen_height + 50
+        if not off_screen.any():
+            return 0
+
+        # Начисляем очко за каждую машину, которую прошли
+        newly_passed = off_screen & ~self.passed[:n]
+        points = int(np.count_nonzero(newly_passed))
+        self.passed[:n] |= off_screen
+
+        # Сдвигаем оставшиеся машины в начало (порядок появления сохраняется)
+        keep = ~off_screen
+        kept = int(np.count_nonzero(keep))
+        for column in self._columns():
+            column[:kept] = column[:n][keep]
+        self.count = kept
+        return points
+
+    def draw(self, screen, alpha=1.0, return_rects=False):
+        """Рисуем все машины одним вызовом blits
+
+        С return_rects=True возвращает список закрашенных прямоугольников.
+        """
+        n = self.count
+        if n == 0:
+            return [] if return_rects else None
+        prev_y = self.prev_y[:n]
+        ys = prev_y + (self.y[:n] - prev_y) * alpha - self.height // 2
+        xs = self.x[:n] - self.width // 2
+        sprites = self.sprites
+        return screen.blits(
+            [(sprites[s], (x, y)) for s, x, y in zip(self.sprite[:n].tolist(), xs.tolist(), ys.tolist())],
+            doreturn=return_rects
+        )
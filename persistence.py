@@ -0,0 +1,111 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+# umask процесса: узнать его можно только установив новый, поэтому
+# читаем один раз при импорте, пока фоновые потоки ещё не создают файлы
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write(path, text):
+    """Записываем файл целиком или не записываем вовсе
+
+    Пишем во временный файл в той же папке и заменяем им старый
+    (os.replace атомарен), поэтому сбой посреди записи не портит файл.
+    Права доступа остаются как у старого файла (новый - как при обычном open).
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    suffix = os.path.splitext(path)[1]
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.tmp_', suffix=suffix)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp создаёт файл с правами 0600 - возвращаем обычные
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class AsyncWriter:
+    """Запись файлов в фоновом потоке
+
+    Игровой поток только кладёт данные в очередь. Если файл успели
+    сохранить несколько раз до записи, на диск попадёт только последняя
+    версия (повторные сохранения объединяются).
+    """
+
+    def __init__(self):
+        self._pending = {}  # путь -> текст (последняя версия)
+        self._busy = False  # Фоновый поток сейчас пишет
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = None
+        self.writes = 0     # Сколько раз реально записали на диск
+        self.errors = 0
+
+    def _start(self):
+        """Запускаем фоновый поток при первой записи"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name='AsyncWriter', daemon=True)
+            self._thread.start()
+
+    def write_text(self, path, text):
+        """Ставим файл в очередь на запись (не ждём диска)"""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("AsyncWriter уже закрыт")
+            self._pending[path] = text
+            self._start()
+            self._condition.notify_all()
+
+    def write_json(self, path, data):
+        """Ставим JSON в очередь на запись"""
+        self.write_text(path, json.dumps(data, ensure_ascii=False, indent=2))
+
+    def _worker(self):
+        """Фоновый поток: пишем всё, что накопилось"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending and self._closed:
+                    return
+                pending = self._pending
+                self._pending = {}
+                self._busy = True
+
+            for path, text in pending.items():
+                try:
+                    atomic_write(path, text)
+                    self.writes += 1
+                except Exception as e:
+                    self.errors += 1
+                    print(f"Ошибка записи {path}: {e}")
+
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Ждём, пока всё из очереди будет записано"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self, timeout=5.0):
+        """Дописываем очередь и останавливаем поток (при выходе из игры)"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
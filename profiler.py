@@ -0,0 +1,204 @@
+import pygame
+import time
+import json
+import csv
+from collections import deque
+import numpy as np
+
+
+class _Section:
+    """Замер одной фазы: with profiler.section("имя"): ..."""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+
+class FrameProfiler:
+    """Профилировщик кадра: сколько времени уходит на каждую фазу
+
+    Для каждой фазы хранит последние window кадров и считает p50/p95/p99.
+    Если задан trace_file, сохраняет замеры каждого кадра и при выходе
+    записывает их в CSV или JSON (по расширению файла).
+    """
+
+    def __init__(self, window=300, trace_file=None):
+        self.window = window
+        self.trace_file = trace_file
+        self.phases = []          # Фазы в порядке первого появления
+        self.history = {}         # фаза -> deque длительностей (нс)
+        self.frame = {}           # Замеры текущего кадра
+        self.trace = []           # Все кадры (только если нужен trace_file)
+        self.frame_start = 0
+        self.frame_count = 0
+        self.overlay_visible = False
+        self._panel = None        # Полупрозрачный фон таблицы
+        self._text = None         # Строки таблицы (рисуем заново, только если числа изменились)
+        self._text_lines = None
+
+    def section(self, name):
+        """Контекстный менеджер для замера фазы"""
+        return _Section(self, name)
+
+    def add(self, name, duration_ns):
+        """Добавляем время к фазе текущего кадра (фаза может идти несколько раз)"""
+        self.frame[name] = self.frame.get(name, 0) + duration_ns
+
+    def begin_frame(self):
+        """Начало кадра"""
+        self.frame = {}
+        self.frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        """Конец кадра: переносим замеры в историю"""
+        self.frame['frame'] = time.perf_counter_ns() - self.frame_start
+        for name, duration in self.frame.items():
+            history = self.history.get(name)
+            if history is None:
+                history = deque(maxlen=self.window)
+                self.history[name] = history
+                self.phases.append(name)
+            history.append(duration)
+
+        if self.trace_file:
+            self.trace.append(self.frame)
+        self.frame_count += 1
+
+    def percentiles(self, name):
+        """(p50, p95, p99) фазы в миллисекундах"""
+        history = self.history.get(name)
+        if not history:
+            return (0.0, 0.0, 0.0)
+        p50, p95, p99 = np.percentile(np.fromiter(history, dtype=np.int64), [50, 95, 99])
+        return (p50 / 1e6, p95 / 1e6, p99 / 1e6)
+
+    def summary(self):
+        """Перцентили всех фаз: {фаза: (p50, p95, p99)}"""
+        return {name: self.percentiles(name) for name in self.phases}
+
+    def toggle_overlay(self):
+        """Показать/скрыть таблицу на экране"""
+        self.overlay_visible = not self.overlay_visible
+
+    def draw_overlay(self, screen, font):
+        """Рисуем таблицу времени фаз поверх игры"""
+        if not self.overlay_visible:
+            return None
+
+        lines = ["фаза            p50     p95     p99 (мс)"]
+        for name, (p50, p95, p99) in self.summary().items():
+            lines.append(f"{name:<14}{p50:6.2f}  {p95:6.2f}  {p99:6.2f}")
+
+        line_height = font.get_linesize()
+        size = (330, line_height * len(lines) + 10)
+        if self._panel is None or self._panel.get_size() != size:
+            self._panel = pygame.Surface(size)
+            self._panel.fill((0, 0, 0))
+            self._panel.set_alpha(180)
+        # Рендер текста не должен искажать замеры, которые он показывает
+        if lines != self._text_lines:
+            self._text = pygame.Surface(size, pygame.SRCALPHA)
+            y = 5
+            for line in lines:
+                self._text.blit(font.render(line, True, (0, 255, 0)), (5, y))
+                y += line_height
+            self._text_lines = lines
+
+        x = screen.get_width() - size[0] - 5
+        rect = screen.blit(self._panel, (x, 5))
+        screen.blit(self._text, (x, 5))
+        return rect
+
+    def dump(self, path=None):
+        """Записываем покадровые замеры в CSV или JSON"""
+        path = path or self.trace_file
+        if not path:
+            return
+        if path.endswith('.json'):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'phases': self.phases, 'frames': self.trace}, f)
+        else:
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['frame_index'] + self.phases)
+                for i, frame in enumerate(self.trace):
+                    writer.writerow([i] + [frame.get(name, 0) for name in self.phases])
+
+
+class _NullSection:
+    """Пустой замер (профилировщик выключен)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullProfiler:
+    """Выключенный профилировщик: те же методы, но ничего не делают"""
+
+    overlay_visible = False
+    _section = _NullSection()
+
+    def section(self, name):
+        return self._section
+
+    def add(self, name, duration_ns):
+        pass
+
+    def begin_frame(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def toggle_overlay(self):
+        pass
+
+    def draw_overlay(self, screen, font):
+        return None
+
+    def dump(self, path=None):
+        pass
+
+
+class StartupTimer:
+    """Время запуска игры по этапам
+
+    start - момент начала отсчёта (по умолчанию - создание таймера).
+    Каждый mark(этап) записывает время с прошлой отметки.
+    """
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.stages = []  # (этап, миллисекунды)
+
+    def mark(self, name):
+        """Этап name закончился"""
+        now = time.perf_counter()
+        self.stages.append((name, (now - self.last) * 1000))
+        self.last = now
+
+    def elapsed_ms(self):
+        """Сколько прошло от начала до последней отметки"""
+        return (self.last - self.start) * 1000
+
+    def report(self):
+        """Таблица этапов запуска"""
+        lines = ["Запуск игры:"]
+        total = 0.0
+        for name, ms in self.stages:
+            total += ms
+            lines.append(f"  {name:<14}{ms:8.1f} мс   (с начала {total:8.1f} мс)")
+        return "\n".join(lines)
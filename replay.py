@@ -0,0 +1,124 @@
+import struct
+import zlib
+
+# Биты управления в одном шаге
+LEFT = 1
+RIGHT = 2
+ACCELERATE = 4
+BRAKE = 8
+
+# Заголовок файла: метка, версия, зерно случайности, частота шагов,
+# число полос (0 - машины где угодно на дороге), число шагов
+MAGIC = b'RPLY'
+VERSION = 2
+HEADER = struct.Struct('<4sHIHHI')
+HEADER_V1 = struct.Struct('<4sHIHI')  # Версия 1 - без полос
+
+
+def encode_controls(controls):
+    """(влево, вправо, газ, тормоз) -> битовая маска"""
+    mask = 0
+    for bit, pressed in zip((LEFT, RIGHT, ACCELERATE, BRAKE), controls):
+        if pressed:
+            mask |= bit
+    return mask
+
+
+def decode_controls(mask):
+    """Битовая маска -> (влево, вправо, газ, тормоз)"""
+    return (bool(mask & LEFT), bool(mask & RIGHT), bool(mask & ACCELERATE), bool(mask & BRAKE))
+
+
+class Replay:
+    """Запись одного заезда: зерно случайности, режим полос и управление на каждом шаге"""
+
+    def __init__(self, seed, tick_rate=60, inputs=b'', lanes=0):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.lanes = lanes  # Число полос (0 - машины где угодно на дороге)
+        self.inputs = bytearray(inputs)  # Один байт (маска) на шаг
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def save(self, path):
+        """Сохраняем запись в компактный двоичный файл"""
+        header = HEADER.pack(MAGIC, VERSION, self.seed, self.tick_rate, self.lanes, len(self.inputs))
+        with open(path, 'wb') as f:
+            f.write(header)
+            f.write(zlib.compress(bytes(self.inputs), 9))
+
+    @classmethod
+    def load(cls, path):
+        """Читаем запись из файла"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version = struct.unpack_from('<4sH', data)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError(f"{path}: это не файл записи заезда")
+        if version == 1:
+            _, _, seed, tick_rate, count = HEADER_V1.unpack_from(data)
+            lanes = 0
+            header_size = HEADER_V1.size
+        else:
+            _, _, seed, tick_rate, lanes, count = HEADER.unpack_from(data)
+            header_size = HEADER.size
+        inputs = zlib.decompress(data[header_size:])
+        if len(inputs) != count:
+            raise ValueError(f"{path}: запись повреждена")
+        return cls(seed, tick_rate, inputs, lanes)
+
+
+class ReplayRecorder:
+    """Записывает управление игрока по шагам"""
+
+    def __init__(self, path):
+        self.path = path
+        self.replay = None
+
+    def start(self, seed, tick_rate, lanes=0):
+        """Начинаем запись нового заезда"""
+        self.replay = Replay(seed, tick_rate, lanes=lanes)
+
+    def record(self, controls):
+        """Записываем управление одного шага"""
+        if self.replay is not None:
+            self.replay.inputs.append(encode_controls(controls))
+
+    def save(self):
+        """Сохраняем текущий заезд в файл"""
+        if self.replay is not None:
+            self.replay.save(self.path)
+
+
+class ReplayPlayer:
+    """Выдаёт записанное управление шаг за шагом"""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.position = 0
+
+    def finished(self):
+        """Запись закончилась"""
+        return self.position >= len(self.replay.inputs)
+
+    def next_controls(self):
+        """Управление следующего шага (после конца записи - ничего не нажато)"""
+        if self.finished():
+            return decode_controls(0)
+        mask = self.replay.inputs[self.position]
+        self.position += 1
+        return decode_controls(mask)
+
+    def get_controls(self, game):
+        """Запись как контроллер игры (см. controllers.py)"""
+        return self.next_controls()
+
+
+def play_headless(replay):
+    """Быстро пересчитываем заезд без окна, возвращаем результат"""
+    from game import Game
+
+    game = Game(headless=True, tick_rate=replay.tick_rate, lanes=replay.lanes or None)
+    player = ReplayPlayer(replay)
+    return game.simulate(lambda g: player.next_controls(), max_frames=len(replay), seed=replay.seed)
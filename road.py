@@ -3,41 +3,127 @@ import pygame
 class Road:
     """Дорога, которая движется вниз"""
     
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, lanes=2, shoulders=False, decorations=False):
         self.width = screen_width
         self.height = screen_height
         self.road_width = 400
         self.base_speed = 5
         self.current_speed = 5
         self.line_offset = 0
+        self.prev_line_offset = 0  # Смещение на прошлом шаге симуляции
+        self.line_period = 60      # Шаг разметки
+        
+        # Внешний вид дороги
+        self.lanes = lanes              # Количество полос (между ними - разметка)
+        self.shoulders = shoulders      # Сплошные белые линии по краям асфальта
+        self.decorations = decorations  # Столбики на обочине
         
         # Цвета
         self.grass_color = (0, 180, 0)
         self.road_color = (60, 60, 60)
         self.line_color = (255, 255, 0)
+        self.shoulder_color = (230, 230, 230)
+        self.post_color = (240, 240, 240)
+        
+        # Заранее нарисованный кусок дороги (создаём при первом рисовании)
+        self.tile = None
     
-    def update(self, player_speed=5):
-        """Двигаем разметку вниз с учётом скорости игрока"""
-        self.current_speed = player_speed
-        self.line_offset += self.current_speed
-        if self.line_offset > 60:
-            self.line_offset = 0
-    
-    def draw(self, screen):
-        """Рисуем дорогу"""
+    def _build_tile(self):
+        """Рисуем дорогу один раз в высокую картинку
+        
+        Картинка повторяется с периодом line_period, поэтому движение
+        дороги - это просто сдвиг картинки на line_offset.
+        """
+        periods = -(-self.height // self.line_period)  # Округляем вверх
+        tile_height = periods * self.line_period
+        tile = pygame.Surface((self.width, tile_height))
+        
         # Трава
-        screen.fill(self.grass_color)
+        tile.fill(self.grass_color)
         
         # Асфальт
-        road_x = (self.width - self.road_width) // 2
-        pygame.draw.rect(screen, self.road_color, 
-                        (road_x, 0, self.road_width, self.height))
+        road_x = self.get_left_edge()
+        pygame.draw.rect(tile, self.road_color, (road_x, 0, self.road_width, tile_height))
+        
+        # Обочины
+        if self.shoulders:
+            pygame.draw.rect(tile, self.shoulder_color, (road_x + 4, 0, 4, tile_height))
+            pygame.draw.rect(tile, self.shoulder_color,
+                             (road_x + self.road_width - 8, 0, 4, tile_height))
+        
+        for y in range(0, tile_height, self.line_period):
+            # Разметка между полосами
+            for line_x in self.get_divider_xs():
+                pygame.draw.rect(tile, self.line_color, (line_x - 5, y, 10, 30))
+            
+            # Столбики на обочине
+            if self.decorations:
+                pygame.draw.rect(tile, self.post_color, (road_x - 20, y, 6, 14))
+                pygame.draw.rect(tile, self.post_color, (road_x + self.road_width + 14, y, 6, 14))
+        
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            tile = tile.convert()
+        self.tile = tile
+    
+    def get_lane_width(self):
+        """Ширина одной полосы"""
+        return self.road_width / self.lanes
+    
+    def get_lane_center(self, lane):
+        """X-координата середины полосы (0 - левая)"""
+        return round(self.get_left_edge() + self.get_lane_width() * (lane + 0.5))
+    
+    def get_lane_at(self, x):
+        """Номер полосы, в которой точка x (за краями - крайняя полоса)"""
+        lane = int((x - self.get_left_edge()) // self.get_lane_width())
+        return min(max(lane, 0), self.lanes - 1)
+    
+    def get_divider_xs(self):
+        """X-координаты линий разметки между полосами"""
+        road_x = self.get_left_edge()
+        lane_width = self.road_width / self.lanes
+        return [round(road_x + lane_width * i) for i in range(1, self.lanes)]
+    
+    def update(self, player_speed=5, dt=1.0):
+        """Двигаем разметку вниз с учётом скорости игрока"""
+        self.current_speed = player_speed
+        self.prev_line_offset = self.line_offset
+        self.line_offset = (self.line_offset + self.current_speed * dt) % self.line_period
+    
+    def get_draw_offset(self, alpha=1.0):
+        """Смещение разметки между прошлым и текущим шагом"""
+        offset = self.line_offset
+        if offset < self.prev_line_offset:
+            # Разметка перескочила через период
+            offset += self.line_period
+        offset = self.prev_line_offset + (offset - self.prev_line_offset) * alpha
+        return offset % self.line_period
+    
+    def draw(self, screen, alpha=1.0):
+        """Рисуем дорогу: два blit заранее нарисованной картинки"""
+        if self.tile is None:
+            self._build_tile()
         
         # Разметка (движется!)
-        for y in range(-60, self.height, 60):
-            line_y = y + self.line_offset
-            pygame.draw.rect(screen, self.line_color,
-                           (self.width // 2 - 5, line_y, 10, 30))
+        line_offset = self.get_draw_offset(alpha)
+        tile_height = self.tile.get_height()
+        screen.blit(self.tile, (0, line_offset - tile_height))
+        screen.blit(self.tile, (0, line_offset))
+    
+    def draw_area(self, screen, rect, alpha=1.0):
+        """Перерисовываем дорогу только внутри rect (для частичного обновления экрана)"""
+        screen.set_clip(rect)
+        self.draw(screen, alpha)
+        screen.set_clip(None)
+    
+    def get_moving_rects(self):
+        """Полосы экрана, которые меняются каждый кадр (разметка и столбики)"""
+        rects = [pygame.Rect(line_x - 5, 0, 10, self.height) for line_x in self.get_divider_xs()]
+        if self.decorations:
+            road_x = self.get_left_edge()
+            rects.append(pygame.Rect(road_x - 20, 0, 6, self.height))
+            rects.append(pygame.Rect(road_x + self.road_width + 14, 0, 6, self.height))
+        return rects
     
     def get_left_edge(self):
         """Левая граница дороги"""
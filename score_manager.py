@@ -1,19 +1,27 @@
 import json
 import os
+from persistence import AsyncWriter, atomic_write
 
 class ScoreManager:
     """Управление очками и рекордами"""
     
-    def __init__(self, save_file="highscore.json"):
+    def __init__(self, save_file="highscore.json", async_save=True):
         self.save_file = save_file
         self.current_score = 0
         self.high_score = 0
         
+        # Рекорд пишется на диск в фоновом потоке, чтобы не тормозить игру
+        self.writer = AsyncWriter() if async_save and save_file else None
+        
         # Загружаем рекорд при создании
         self.load_high_score()
     
     def load_high_score(self):
         """Загружаем рекорд из файла"""
+        if self.save_file is None:
+            # Без файла (режим симуляции) - рекорд только в памяти
+            self.high_score = 0
+            return
         try:
             if os.path.exists(self.save_file):
                 with open(self.save_file, 'r', encoding='utf-8') as f:
@@ -26,14 +34,24 @@ class ScoreManager:
             self.high_score = 0
     
     def save_high_score(self):
-        """Сохраняем рекорд в файл"""
+        """Сохраняем рекорд в файл (атомарно: файл не испортится при сбое)"""
+        if self.save_file is None:
+            return
+        data = {'high_score': self.high_score}
         try:
-            data = {'high_score': self.high_score}
-            with open(self.save_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except:
-            # Если не получилось сохранить - просто игнорируем
-            pass
+            if self.writer:
+                # В фоне: повторные сохранения до записи объединяются
+                self.writer.write_json(self.save_file, data)
+            else:
+                atomic_write(self.save_file, json.dumps(data, ensure_ascii=False, indent=2))
+        except Exception as e:
+            # Если не получилось сохранить - игра продолжается
+            print(f"Ошибка сохранения рекорда: {e}")
+    
+    def close(self):
+        """Дописываем рекорд на диск (при выходе из игры)"""
+        if self.writer:
+            self.writer.close()
     
     def add_score(self, points=1):
         """Добавляем очки"""
@@ -161,6 +179,7 @@ if __name__ == "__main__":
     
     # Сохраняем при выходе
     score_manager.save_high_score()
+    score_manager.close()
     pygame.quit()
     
     # Удаляем демо-файл
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """Кэш отрисованного текста
+
+    font.render - одна из самых дорогих операций в кадре, а строки на экране
+    почти не меняются. Храним готовые картинки по ключу
+    (шрифт, текст, цвет, сглаживание); давно не использованные удаляем (LRU).
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Картинка с текстом (рисуем только при первом запросе)"""
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def get_stats(self):
+        """Статистика кэша"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._surfaces)}
+
+    def clear(self):
+        """Очищаем кэш"""
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class HudLabel:
+    """Надпись интерфейса, привязанная к значению
+
+    Текст перерисовывается только когда значение getter() изменилось.
+    """
+
+    def __init__(self, font, template, color, getter, pos):
+        self.font = font
+        self.template = template  # Например "ОЧКИ: {}"
+        self.color = color
+        self.getter = getter
+        self.pos = pos
+        self.value = None
+        self.surface = None
+
+    def draw(self, screen):
+        """Рисуем надпись, возвращаем закрашенный прямоугольник"""
+        value = self.getter()
+        if self.surface is None or value != self.value:
+            self.value = value
+            self.surface = self.font.render(self.template.format(value), True, self.color)
+        return screen.blit(self.surface, self.pos)
+
+
+# Один кэш на весь процесс
+text_cache = TextCache()
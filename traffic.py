@@ -0,0 +1,187 @@
+import random
+
+import numpy as np
+
+
+class LaneTraffic:
+    """Встречные машины по полосам дороги
+
+    Машины лежат в общем ObstacleStore (столбец lane - номер полосы), а здесь
+    индекс по полосам: строки каждой полосы, отсортированные по y сверху вниз.
+    Индекс строится одной сортировкой массива после шага, дальше запросы дешёвые:
+      - верхняя машина полосы (зазор при появлении новой) - O(1),
+      - ближайшая машина полосы выше или ниже точки - O(log n),
+      - машина, догнавшая переднюю в своей полосе, едет следом, а не сквозь неё.
+    """
+
+    def __init__(self, road, store, spawn_gap=None, follow_gap=40, open_lanes=1):
+        self.road = road
+        self.store = store
+        self.lanes = road.lanes
+        # Зазор между машинами одной полосы при появлении (по умолчанию - две машины)
+        self.spawn_gap = spawn_gap if spawn_gap is not None else store.height * 2
+        # Какой зазор машина держит до передней в своей полосе
+        self.follow_gap = follow_gap
+        # Сколько полос у верхнего края всегда оставляем свободными (нет "стены")
+        self.open_lanes = min(open_lanes, self.lanes - 1)
+
+        self._order = np.zeros(0, dtype=np.intp)            # Строки: по полосам, в полосе - по y
+        self._ys = np.zeros(0, dtype=np.float64)            # y в том же порядке
+        self._starts = np.zeros(self.lanes + 1, dtype=np.intp)  # Где в _order начинается полоса
+        self._dirty = True
+
+    def invalidate(self):
+        """Машины изменились снаружи (например, store.clear()) - индекс построим заново"""
+        self._dirty = True
+
+    def rebuild(self):
+        """Сортируем машины по полосам и по y внутри полосы"""
+        store = self.store
+        n = store.count
+        lanes = store.lane[:n]
+        ys = store.y[:n]
+        order = np.lexsort((ys, lanes))
+        self._order = order
+        self._ys = ys[order]
+        # Машины без полосы (-1) оказываются в начале и в индекс не попадают
+        self._starts = np.searchsorted(lanes[order], np.arange(self.lanes + 1))
+        self._dirty = False
+
+    def _lane_range(self, lane):
+        if self._dirty:
+            self.rebuild()
+        return int(self._starts[lane]), int(self._starts[lane + 1])
+
+    def lane_rows(self, lane):
+        """Строки машин полосы сверху вниз"""
+        start, end = self._lane_range(lane)
+        return self._order[start:end]
+
+    def top(self, lane):
+        """Верхняя машина полосы (появилась последней): номер строки или None"""
+        start, end = self._lane_range(lane)
+        return int(self._order[start]) if start < end else None
+
+    def above(self, lane, y):
+        """Ближайшая машина полосы выше точки y (едет навстречу): строка или None"""
+        start, end = self._lane_range(lane)
+        i = start + int(np.searchsorted(self._ys[start:end], y))
+        return int(self._order[i - 1]) if i > start else None
+
+    def below(self, lane, y):
+        """Ближайшая машина полосы ниже точки y (уже проехала): строка или None"""
+        start, end = self._lane_range(lane)
+        i = start + int(np.searchsorted(self._ys[start:end], y, side='right'))
+        return int(self._order[i]) if i < end else None
+
+    def nearest(self, x, y):
+        """Ближайшая по y машина в полосе, где точка (x, y): строка или None"""
+        lane = self.road.get_lane_at(x)
+        candidates = [row for row in (self.above(lane, y), self.below(lane, y)) if row is not None]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda row: abs(self.store.y[row] - y))
+
+    def is_clear(self, lane, y):
+        """Можно ли поставить машину в полосу на высоту y (зазор до верхней машины)"""
+        row = self.top(lane)
+        return row is None or self.store.y[row] - y >= self.spawn_gap
+
+    def pick_lane(self, y, rng=random):
+        """Полоса для новой машины на высоте y или None (подождать)
+
+        Берём случайную из полос с нужным зазором, но так, чтобы хотя бы
+        open_lanes полос у верхнего края остались свободными.
+        """
+        free = [lane for lane in range(self.lanes) if self.is_clear(lane, y)]
+        if len(free) <= self.open_lanes:
+            return None
+        return rng.choice(free)
+
+    def spawn(self, lane, y, speed, rng=random):
+        """Ставим машину в полосу, возвращаем номер её строки
+
+        Машина едет не обязательно по середине: в любом месте полосы,
+        не заезжая за разметку. Иначе между машинами соседних полос
+        (и на самой разметке) всегда оставалось бы безопасное место.
+        """
+        slack = max(0.0, (self.road.get_lane_width() - self.store.width) / 2)
+        x = self.road.get_lane_center(lane) + rng.uniform(-slack, slack)
+        row = self.store.spawn(x, y, speed, rng=rng, lane=lane)
+        self._dirty = True
+        return row
+
+    def follow(self, dt=1.0):
+        """Машина, догоняющая переднюю в своей полосе, едет с её скоростью
+
+        Зазор считаем на конец шага, поэтому даже очень быстрая машина
+        не въедет в переднюю. Если передняя сама притормозила за своей,
+        повторяем - колонна выравнивается за один шаг.
+        """
+        if self._dirty:
+            self.rebuild()
+        start, end = int(self._starts[0]), int(self._starts[-1])
+        if end - start < 2:
+            return
+        store = self.store
+        order = self._order[start:end]
+        ys = self._ys[start:end]
+        lanes = store.lane[order]
+        # Передняя машина (ниже на экране) - следующая в индексе, если в той же полосе
+        same = lanes[:-1] == lanes[1:]
+        rows = order[:-1][same]
+        leaders = order[1:][same]
+        gaps = (ys[1:] - ys[:-1])[same] - store.height - self.follow_gap
+        while True:
+            speeds = store.speed[rows]
+            leader_speeds = store.speed[leaders]
+            slow_down = (speeds > leader_speeds) & ((speeds - leader_speeds) * dt > gaps)
+            if not slow_down.any():
+                break
+            store.speed[rows[slow_down]] = leader_speeds[slow_down]
+
+    def update(self, screen_height, dt=1.0):
+        """Шаг движения: сначала подстраиваем скорости, потом двигаем все машины
+
+        Возвращает, сколько машин мы обошли (как ObstacleStore.update).
+        """
+        self.follow(dt)
+        points = self.store.update(screen_height, dt)
+        self._dirty = True
+        return points
+
+
+# ===== ПРОВЕРКА =====
+if __name__ == "__main__":
+    """Проверка: в режиме полос стоящего игрока должны сбивать
+
+    Игрок, который ничего не нажимает или стоит на разметке, должен
+    рано или поздно столкнуться - иначе в режиме полос нет опасности.
+    """
+
+    import os
+    import sys
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    from game import Game
+    from controllers import IdlePolicy
+
+    def parked(x):
+        """Бот, который едет к x и стоит там"""
+        return lambda game: (game.car.x > x + 2, game.car.x < x - 2, False, False)
+
+    runs = 20
+    max_frames = 60 * 60 * 5
+    failed = False
+    for lanes in range(2, 6):
+        game = Game(headless=True, lanes=lanes)
+        policies = [("стоит на месте", IdlePolicy())]
+        policies += [(f"на разметке x={x}", parked(x)) for x in game.road.get_divider_xs()]
+        for name, policy in policies:
+            results = [game.simulate(policy, max_frames, seed) for seed in range(runs)]
+            crashed = sum(result['crashed'] for result in results)
+            print(f"Полос: {lanes}, {name}: сбит в {crashed} из {runs} заездов")
+            failed = failed or crashed == 0
+    sys.exit(1 if failed else 0)